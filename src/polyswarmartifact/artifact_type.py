@@ -1,11 +1,24 @@
 import logging
 from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 
+from . import content as _content
 from .exceptions import DecodeError
 
 logger = logging.getLogger(__name__)
 
 
+class DecodeResult(NamedTuple):
+    """
+    Outcome of decoding a batch of artifact contents
+
+    ``results`` holds one entry per input, ``None`` where the input was None or failed.
+    ``errors`` maps the index of each failed input to its DecodeError
+    """
+    results: List[Optional[Union[str, memoryview]]]
+    errors: Dict[int, DecodeError]
+
+
 class ArtifactType(Enum):
     FILE = 0
     URL = 1
@@ -28,8 +41,64 @@ class ArtifactType(Enum):
 
         if self == ArtifactType.URL:
             try:
-                return content.decode('utf-8')
+                # str() decodes any buffer, such as a memoryview or mmap, without copying it first
+                return str(content, 'utf-8')
             except UnicodeDecodeError:
                 raise DecodeError('Error decoding URL')
         else:
             return content
+
+    def decode_many(self, contents: Iterable[Any]) -> DecodeResult:
+        """
+        Decode a batch of contents, given as bytes, bytearray, memoryview or mmap objects
+
+        A batch of URLs that are all valid bytes is decoded in one pass, with UTF-8's ASCII fast path,
+        otherwise each URL is decoded on its own. Files are returned as memoryviews over the original
+        contents, without copying. Failures are reported per item instead of raised.
+        """
+        contents = list(contents)
+        if self == ArtifactType.URL:
+            try:
+                return DecodeResult(list(map(bytes.decode, contents)), {})
+            except (TypeError, UnicodeDecodeError):
+                # not all bytes, or not all valid, so decode one at a time
+                pass
+
+        results: List[Optional[Union[str, memoryview]]] = []
+        errors: Dict[int, DecodeError] = {}
+        for index, content in enumerate(contents):
+            result = None
+            if content is not None:
+                try:
+                    # str() decodes any buffer, without copying it to bytes first
+                    result = str(content, 'utf-8') if self == ArtifactType.URL else memoryview(content)
+                except UnicodeDecodeError:
+                    errors[index] = DecodeError('Error decoding URL')
+                except TypeError:
+                    errors[index] = DecodeError('Content is not bytes-like')
+            results.append(result)
+        return DecodeResult(results, errors)
+
+    def iter_content(
+        self,
+        source: _content.Source,
+        chunk_size: int = _content.DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[memoryview]:
+        """
+        Yield the contents of a path or binary file object in chunks, memory-mapped where possible
+
+        See :func:`polyswarmartifact.content.iter_chunks`
+        """
+        return _content.iter_chunks(source, chunk_size)
+
+    def scan_content(
+        self,
+        source: _content.Source,
+        chunk_size: int = _content.DEFAULT_CHUNK_SIZE,
+    ) -> _content.ContentInfo:
+        """
+        Compute the FileArtifact fields of a path or binary file object in a single read pass
+
+        See :func:`polyswarmartifact.content.scan`
+        """
+        return _content.scan(source, chunk_size)
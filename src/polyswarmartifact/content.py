@@ -0,0 +1,145 @@
+"""
+Chunked access to artifact contents too large to hold in memory as one bytes object
+"""
+import hashlib
+import mmap
+import os
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# bytes of the first chunk looked at to sniff the mimetype
+SNIFF_SIZE = 8192
+
+# (offset, magic bytes, mimetype), mimetypes as reported by libmagic
+SIGNATURES = (
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'PK\x03\x04', 'application/zip'),
+    (0, b'PK\x05\x06', 'application/zip'),
+    (0, b'\x1f\x8b', 'application/gzip'),
+    (0, b'BZh', 'application/x-bzip2'),
+    (0, b'\xfd7zXZ\x00', 'application/x-xz'),
+    (0, b'7z\xbc\xaf\x27\x1c', 'application/x-7z-compressed'),
+    (0, b'Rar!\x1a\x07', 'application/x-rar'),
+    (0, b'\x7fELF', 'application/x-executable'),
+    (0, b'MZ', 'application/x-dosexec'),
+    (0, b'\xca\xfe\xba\xbe', 'application/x-mach-binary'),
+    (0, b'\xcf\xfa\xed\xfe', 'application/x-mach-binary'),
+    (0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/CDFV2'),
+    (0, b'{\\rtf', 'text/rtf'),
+    (257, b'ustar', 'application/x-tar'),
+)
+
+# control characters that may appear in text
+_TEXT_CONTROLS = b'\t\n\r\f\b\x1b'
+_BINARY_CONTROLS = bytes(set(range(0, 0x20)) - set(_TEXT_CONTROLS)) + b'\x7f'
+
+Source = Union[str, 'os.PathLike[str]', BinaryIO]
+
+
+class ContentInfo(NamedTuple):
+    """
+    FileArtifact fields computed from an artifact's contents, with digests as raw bytes
+    """
+    sha256: bytes
+    sha1: bytes
+    md5: bytes
+    filesize: int
+    mimetype: str
+
+
+def sniff_mimetype(head: Union[bytes, memoryview]) -> str:
+    """
+    Guess a mimetype from the first bytes of a file, by magic number or as text
+    """
+    head = bytes(head[:SNIFF_SIZE])
+    if not head:
+        return 'application/x-empty'
+    for offset, magic, mimetype in SIGNATURES:
+        if head.startswith(magic, offset):
+            return mimetype
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # a multi-byte character may be cut off at the end of the sample
+        if e.start < len(head) - 3 or e.reason != 'unexpected end of data':
+            return 'application/octet-stream'
+    if head.translate(None, _BINARY_CONTROLS) != head:
+        return 'application/octet-stream'
+    return 'text/plain'
+
+
+def _map(fp: BinaryIO) -> Optional[mmap.mmap]:
+    try:
+        fileno = fp.fileno()
+        if os.fstat(fileno).st_size == 0:
+            return None
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # not backed by a regular file, e.g. BytesIO or a pipe
+        return None
+    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
+
+
+def _iter_file(fp: BinaryIO, chunk_size: int) -> Iterator[memoryview]:
+    mapped = _map(fp)
+    if mapped is None:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                return
+            yield memoryview(chunk)
+
+    view = memoryview(mapped)
+    try:
+        for offset in range(fp.tell(), len(mapped), chunk_size):
+            yield view[offset:offset + chunk_size]
+        fp.seek(0, os.SEEK_END)
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            # chunks are still held elsewhere, the map is closed once they are freed
+            pass
+
+
+def iter_chunks(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield the contents of a path or binary file object in chunks of up to `chunk_size` bytes
+
+    Regular files are memory-mapped and chunks are views into the map, so nothing is copied. File
+    objects are read from their current position to the end.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as fp:
+            yield from _iter_file(fp, chunk_size)
+    else:
+        yield from _iter_file(source, chunk_size)
+
+
+def scan(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ContentInfo:
+    """
+    Hash, measure and sniff the contents of a path or binary file object in a single read pass
+    """
+    sha256 = hashlib.sha256()
+    sha1 = hashlib.sha1()
+    md5 = hashlib.md5()
+    filesize = 0
+    head = b''
+    for chunk in iter_chunks(source, chunk_size):
+        # release each chunk once hashed, so the map can be closed at the end
+        with chunk:
+            if len(head) < SNIFF_SIZE:
+                head += chunk[:SNIFF_SIZE - len(head)]
+            sha256.update(chunk)
+            sha1.update(chunk)
+            md5.update(chunk)
+            filesize += len(chunk)
+    return ContentInfo(sha256.digest(), sha1.digest(), md5.digest(), filesize, sniff_mimetype(head))
@@ -1,16 +1,66 @@
-from .schema import Schema
-from .assertion import Assertion
-from .bounty import Bounty, FileArtifact, URLArtifact
-from .verdict import Verdict, Scanner, StixSignature, ScanMetadata
+"""
+Pydantic models of polyswarm artifacts
+
+Models are imported from their submodules when first accessed, so importing this package, or any
+submodule that needs only some of them, does not pay for the rest.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .schema import BatchResult, RawJSON, Schema
+    from .assertion import Assertion
+    from .bounty import Bounty, CompactFileArtifact, FileArtifact, URLArtifact
+    from .verdict import Verdict, Scanner, StixSignature, ScanMetadata
+    from .view import VerdictView
+    from .columnar import VerdictBatch
+
+# public name -> submodule it is imported from
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    'BatchResult': 'schema',
+    'RawJSON': 'schema',
+    'Schema': 'schema',
+    'Assertion': 'assertion',
+    'Bounty': 'bounty',
+    'CompactFileArtifact': 'bounty',
+    'FileArtifact': 'bounty',
+    'URLArtifact': 'bounty',
+    'Verdict': 'verdict',
+    'Scanner': 'verdict',
+    'StixSignature': 'verdict',
+    'ScanMetadata': 'verdict',
+    'VerdictView': 'view',
+    'VerdictBatch': 'columnar',
+}
 
 __all__ = [
     'Assertion',
+    'BatchResult',
     'Bounty',
+    'RawJSON',
     'Schema',
     'Verdict',
+    'VerdictBatch',
+    'VerdictView',
     'ScanMetadata',
     'FileArtifact',
+    'CompactFileArtifact',
     'URLArtifact',
     'Scanner',
     'StixSignature',
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name)) from None
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    # cache it, so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,55 @@
+"""
+Asyncio helpers that keep validation of large payloads off the event loop
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Optional, Union
+
+from .schema import get_adapter
+
+# payloads of at least this many bytes are validated in an executor, smaller ones inline
+DEFAULT_THRESHOLD = 64 * 1024
+
+_executor: Optional[Executor] = None
+_threshold = DEFAULT_THRESHOLD
+
+
+def configure(executor: Optional[Executor] = None, threshold: int = DEFAULT_THRESHOLD):
+    """
+    Set the executor and size threshold used by :func:`avalidate_json`
+
+    :param executor: thread or process pool to validate large payloads in, or None for the event
+        loop's default executor
+    :param threshold: payload size in bytes from which validation leaves the event loop
+    """
+    global _executor, _threshold
+    _executor = executor
+    _threshold = threshold
+
+
+def _validate_json(type_: Any, data: Union[bytes, bytearray, str]) -> Any:
+    return get_adapter(type_).validate_json(data)
+
+
+async def avalidate_json(
+    type_: Any,
+    data: Union[bytes, bytearray, str],
+    executor: Optional[Executor] = None,
+    threshold: Optional[int] = None,
+) -> Any:
+    """
+    Validate a JSON payload as `type_` without blocking the event loop on large payloads
+
+    Payloads below the threshold are validated inline, since handing them to an executor costs more
+    than validating them. With a process pool, `type_` and the result are pickled between processes.
+
+    :param type_: model class (or union of them) to validate as
+    :param data: JSON payload
+    :param executor: overrides the executor set with :func:`configure`
+    :param threshold: overrides the threshold set with :func:`configure`
+    :raises ValidationError: if the payload is invalid
+    """
+    if len(data) < (_threshold if threshold is None else threshold):
+        return _validate_json(type_, data)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _executor, _validate_json, type_, data)
@@ -0,0 +1,209 @@
+"""
+Random access to NDJSON archives of stored records through a memory map and a sidecar index
+
+An archive is any file of one JSON record per line, such as one written by
+:func:`~polyswarmartifact.schema.stream.write_ndjson`. Its index (``<archive>.idx`` by default) holds
+the byte range of every record, plus a sorted table of the artifact sha256 digests found in them::
+
+    header   magic, record count, digest count, archive size
+    records  (start, end) byte offsets per record
+    digests  (sha256, record number) pairs, sorted by sha256
+"""
+import mmap
+import os
+import struct
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from pydantic_core import from_json
+
+from ..exceptions import DecodeError
+from .bounty import Bounty
+from .schema import get_adapter
+
+INDEX_MAGIC = b'PSARCIX1'
+INDEX_SUFFIX = '.idx'
+
+_HEADER = struct.Struct('<8sQQQ')
+_RECORD = struct.Struct('<QQ')
+_DIGEST = struct.Struct('<32sQ')
+
+
+def _map(path: str) -> Union[mmap.mmap, bytes]:
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return b''
+
+
+def _record_digests(record: Any) -> Iterator[bytes]:
+    """
+    Binary sha256 digests of the artifacts in a decoded record
+    """
+    items = record if isinstance(record, list) else [record]
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        sha256 = item.get('sha256')
+        if isinstance(sha256, str) and len(sha256) == 64:
+            try:
+                yield bytes.fromhex(sha256)
+            except ValueError:
+                pass
+
+
+def build_index(path: str, index_path: Optional[str] = None) -> int:
+    """
+    Scan an archive once and write its sidecar index
+
+    :param path: archive to index
+    :param index_path: where to write the index, defaults to the archive path plus ``.idx``
+    :return: number of records indexed
+    :raises DecodeError: if a record is not valid JSON
+    """
+    data = _map(path)
+    records: List[Tuple[int, int]] = []
+    digests: List[Tuple[bytes, int]] = []
+    try:
+        position = 0
+        size = len(data)
+        while position < size:
+            newline = data.find(b'\n', position)
+            end = size if newline == -1 else newline
+            start = position
+            position = end + 1
+            # strip surrounding whitespace without copying the line
+            while start < end and data[start:start + 1].isspace():
+                start += 1
+            while end > start and data[end - 1:end].isspace():
+                end -= 1
+            if start == end:
+                continue
+
+            try:
+                record = from_json(data[start:end])
+            except ValueError as e:
+                raise DecodeError('Invalid record at byte {}'.format(start)) from e
+            digests.extend((digest, len(records)) for digest in _record_digests(record))
+            records.append((start, end))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    digests.sort()
+    with open(index_path or path + INDEX_SUFFIX, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, len(records), len(digests), size))
+        for record in records:
+            f.write(_RECORD.pack(*record))
+        for digest in digests:
+            f.write(_DIGEST.pack(*digest))
+    return len(records)
+
+
+class Archive:
+    """
+    Read-only, memory-mapped archive of records
+
+    Records are only decoded when read through :meth:`__getitem__` or :meth:`find_sha256`, and
+    :meth:`raw` returns them as views into the map, without copying. Views must be released before
+    :meth:`close`.
+
+    :param path: archive file
+    :param type_: model class (or union of them) records decode as
+    :param index_path: sidecar index, defaults to the archive path plus ``.idx``
+    :param build: build the index when it does not exist yet
+    :raises DecodeError: if the index is invalid or was built for a different version of the archive
+    """
+
+    def __init__(self, path: str, type_: Any = Bounty, index_path: Optional[str] = None, build: bool = True):
+        index_path = index_path or path + INDEX_SUFFIX
+        if build and not os.path.exists(index_path):
+            build_index(path, index_path)
+
+        self.type_ = type_
+        self._data = _map(path)
+        self._index = _map(index_path)
+        self._view = memoryview(self._data)
+        if len(self._index) < _HEADER.size:
+            self.close()
+            raise DecodeError('Truncated archive index')
+        magic, self._count, self._digest_count, size = _HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise DecodeError('Not an archive index')
+        if size != len(self._data) or len(self._index) != _HEADER.size + self._count * _RECORD.size \
+                + self._digest_count * _DIGEST.size:
+            self.close()
+            raise DecodeError('Archive index is stale, rebuild it with build_index()')
+        self._digests_offset = _HEADER.size + self._count * _RECORD.size
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        for data in (self._data, self._index):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def raw(self, number: int) -> memoryview:
+        """
+        The encoded record `number`, as a view into the archive
+        """
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError('record number out of range')
+        start, end = _RECORD.unpack_from(self._index, _HEADER.size + number * _RECORD.size)
+        return self._view[start:end]
+
+    def __getitem__(self, number: int) -> Any:
+        """
+        Decode record `number`
+
+        :raises ValidationError: if the record is not a valid `type_`
+        """
+        with self.raw(number) as raw:
+            return get_adapter(self.type_).validate_json(raw.tobytes())
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[number] for number in range(0, self._count))
+
+    def _digest_at(self, position: int) -> Tuple[bytes, int]:
+        return _DIGEST.unpack_from(self._index, self._digests_offset + position * _DIGEST.size)
+
+    def records_with_sha256(self, sha256: Union[str, bytes]) -> List[int]:
+        """
+        Numbers of the records holding an artifact with this sha256, found by binary search of the index
+        """
+        digest = bytes.fromhex(sha256) if isinstance(sha256, str) else sha256
+        low, high = 0, self._digest_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._digest_at(middle)[0] < digest:
+                low = middle + 1
+            else:
+                high = middle
+
+        numbers = []
+        while low < self._digest_count:
+            found, number = self._digest_at(low)
+            if found != digest:
+                break
+            if not numbers or numbers[-1] != number:
+                numbers.append(number)
+            low += 1
+        return numbers
+
+    def find_sha256(self, sha256: Union[str, bytes]) -> List[Any]:
+        """
+        Decode the records holding an artifact with this sha256
+        """
+        return [self[number] for number in self.records_with_sha256(sha256)]
@@ -2,13 +2,18 @@ from typing import List
 
 from pydantic import Field, RootModel
 
-from .schema import Schema, chainable
-from .verdict import Verdict
+from .schema import SERIALIZATION_PROFILES, Schema, chainable
+from .verdict import INDEX_FIELDS, Verdict
 
 
 class Assertion(RootModel, Schema):
     root: List[Verdict] = Field(min_items=1, max_items=256, default=[])
 
+    serialization_profiles = {
+        **SERIALIZATION_PROFILES,
+        'index': {'by_alias': True, 'include': {'__all__': INDEX_FIELDS}},
+    }
+
     @property
     def artifacts(self):
         return self.root
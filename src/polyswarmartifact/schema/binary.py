@@ -0,0 +1,302 @@
+"""
+Compact binary encoding for schema objects
+
+Objects are encoded as MessagePack, so any MessagePack implementation can read them. The encoded form
+mirrors ``Schema.json()``, except that lowercase hex digests are stored as raw bytes and IP addresses
+as their packed 4 or 16 byte form. Encoded objects are self-delimiting, so a stream is just their
+concatenation.
+"""
+import ipaddress
+import struct
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Tuple
+
+from ..exceptions import DecodeError
+from .assertion import Assertion
+from .bounty import Artifact, Bounty, FileArtifact
+from .schema import Schema, get_adapter
+from .verdict import ScanMetadata, Verdict
+
+DIGEST_FIELDS = ('sha256', 'sha1', 'md5')
+
+_UINT8 = struct.Struct('>B')
+_UINT16 = struct.Struct('>H')
+_UINT32 = struct.Struct('>I')
+_UINT64 = struct.Struct('>Q')
+_INT8 = struct.Struct('>b')
+_INT16 = struct.Struct('>h')
+_INT32 = struct.Struct('>i')
+_INT64 = struct.Struct('>q')
+_FLOAT32 = struct.Struct('>f')
+_FLOAT64 = struct.Struct('>d')
+
+
+class _OutOfData(Exception):
+    def __init__(self, needed: int):
+        super().__init__(needed)
+        # length the data must have to get further
+        self.needed = needed
+
+
+def _pack_length(out: bytearray, length: int, fix: int, fix_limit: int, codes: Tuple[int, int, int]):
+    if length < fix_limit:
+        out.append(fix | length)
+    elif length < 0x100 and codes[0]:
+        out.append(codes[0])
+        out += _UINT8.pack(length)
+    elif length < 0x10000:
+        out.append(codes[1])
+        out += _UINT16.pack(length)
+    else:
+        out.append(codes[2])
+        out += _UINT32.pack(length)
+
+
+def _pack(value: Any, out: bytearray):
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -0x20 <= value < 0:
+            out.append(value & 0xff)
+        elif value >= 0:
+            for code, packer in ((0xcc, _UINT8), (0xcd, _UINT16), (0xce, _UINT32), (0xcf, _UINT64)):
+                if value < 1 << (packer.size * 8):
+                    out.append(code)
+                    out += packer.pack(value)
+                    break
+            else:
+                raise ValueError('integer {} is too large to encode'.format(value))
+        else:
+            for code, packer in ((0xd0, _INT8), (0xd1, _INT16), (0xd2, _INT32), (0xd3, _INT64)):
+                if value >= -(1 << (packer.size * 8 - 1)):
+                    out.append(code)
+                    out += packer.pack(value)
+                    break
+            else:
+                raise ValueError('integer {} is too small to encode'.format(value))
+    elif isinstance(value, float):
+        out.append(0xcb)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _pack_length(out, len(encoded), 0xa0, 0x20, (0xd9, 0xda, 0xdb))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_length(out, len(value), 0, 0, (0xc4, 0xc5, 0xc6))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        _pack_length(out, len(value), 0x90, 0x10, (0, 0xdc, 0xdd))
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        _pack_length(out, len(value), 0x80, 0x10, (0, 0xde, 0xdf))
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise TypeError('cannot encode {}'.format(type(value).__name__))
+
+
+def _unpack_bytes(data: bytes, offset: int, length: int) -> Tuple[bytes, int]:
+    end = offset + length
+    if end > len(data):
+        raise _OutOfData(end)
+    raw = data[offset:end]
+    return (raw if type(raw) is bytes else bytes(raw)), end
+
+
+def _unpack_struct(data: bytes, offset: int, packer: struct.Struct) -> Tuple[Any, int]:
+    if offset + packer.size > len(data):
+        raise _OutOfData(offset + packer.size)
+    return packer.unpack_from(data, offset)[0], offset + packer.size
+
+
+def _unpack(data: bytes, offset: int) -> Tuple[Any, int]:
+    if offset >= len(data):
+        raise _OutOfData(offset + 1)
+    code = data[offset]
+    offset += 1
+    if code < 0x80:
+        return code, offset
+    if code >= 0xe0:
+        return code - 0x100, offset
+    if 0xa0 <= code <= 0xbf:
+        raw, offset = _unpack_bytes(data, offset, code & 0x1f)
+        return raw.decode('utf-8'), offset
+    if 0x90 <= code <= 0x9f:
+        return _unpack_array(data, offset, code & 0x0f)
+    if 0x80 <= code <= 0x8f:
+        return _unpack_map(data, offset, code & 0x0f)
+    if code == 0xc0:
+        return None, offset
+    if code == 0xc2:
+        return False, offset
+    if code == 0xc3:
+        return True, offset
+    if code in _SCALARS:
+        return _unpack_struct(data, offset, _SCALARS[code])
+    if code in _SIZED:
+        kind, packer = _SIZED[code]
+        length, offset = _unpack_struct(data, offset, packer)
+        if kind == 'array':
+            return _unpack_array(data, offset, length)
+        if kind == 'map':
+            return _unpack_map(data, offset, length)
+        raw, offset = _unpack_bytes(data, offset, length)
+        return (raw.decode('utf-8') if kind == 'str' else raw), offset
+    raise DecodeError('unsupported type code 0x{:02x}'.format(code))
+
+
+def _unpack_array(data: bytes, offset: int, length: int) -> Tuple[list, int]:
+    items = []
+    for _ in range(length):
+        item, offset = _unpack(data, offset)
+        items.append(item)
+    return items, offset
+
+
+def _unpack_map(data: bytes, offset: int, length: int) -> Tuple[dict, int]:
+    items = {}
+    for _ in range(length):
+        key, offset = _unpack(data, offset)
+        items[key], offset = _unpack(data, offset)
+    return items, offset
+
+
+_SCALARS = {
+    0xca: _FLOAT32, 0xcb: _FLOAT64,
+    0xcc: _UINT8, 0xcd: _UINT16, 0xce: _UINT32, 0xcf: _UINT64,
+    0xd0: _INT8, 0xd1: _INT16, 0xd2: _INT32, 0xd3: _INT64,
+}
+_SIZED = {
+    0xc4: ('bin', _UINT8), 0xc5: ('bin', _UINT16), 0xc6: ('bin', _UINT32),
+    0xd9: ('str', _UINT8), 0xda: ('str', _UINT16), 0xdb: ('str', _UINT32),
+    0xdc: ('array', _UINT16), 0xdd: ('array', _UINT32),
+    0xde: ('map', _UINT16), 0xdf: ('map', _UINT32),
+}
+
+
+def _convert(value: Any, type_: Any, digest: Callable[[Any], Any], address: Callable[[Any], Any]) -> Any:
+    """
+    Apply `digest` to the digests and `address` to the IP addresses of a dumped `type_` object, in place
+    """
+    if isinstance(type_, type) and issubclass(type_, (Assertion, Bounty)):
+        item_type = ScanMetadata if issubclass(type_, Assertion) else Artifact
+        return [_convert(item, item_type, digest, address) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if type_ is Artifact or isinstance(type_, type) and issubclass(type_, FileArtifact):
+        for field in DIGEST_FIELDS:
+            if value.get(field) is not None:
+                value[field] = digest(value[field])
+    elif isinstance(type_, type) and issubclass(type_, ScanMetadata) and value.get('ip_addresses'):
+        value['ip_addresses'] = [address(ip_address) for ip_address in value['ip_addresses']]
+    return value
+
+
+def _pack_digest(value: str) -> Any:
+    # uppercase digests stay as text so they round trip unchanged
+    return bytes.fromhex(value) if value.islower() or value.isdigit() else value
+
+
+def _unpack_digest(value: Any) -> str:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+def _pack_address(value: str) -> bytes:
+    return ipaddress.ip_address(value).packed
+
+
+def _unpack_address(value: Any) -> str:
+    return str(ipaddress.ip_address(value)) if isinstance(value, bytes) else value
+
+
+def encode(record: Schema, validate: bool = True) -> bytes:
+    """
+    Encode a schema object
+
+    :param record: object to encode
+    :param validate: validate the object before encoding it, see :meth:`Schema.check`
+    """
+    if validate:
+        record.check()
+    data = record.model_dump(mode='json', by_alias=True, exclude_defaults=True)
+    out = bytearray()
+    _pack(_convert(data, type(record), _pack_digest, _pack_address), out)
+    return bytes(out)
+
+
+def _decode_value(value: Any, type_: Any) -> Any:
+    return get_adapter(type_).validate_python(_convert(value, type_, _unpack_digest, _unpack_address))
+
+
+def decode(data: bytes, type_: Any = Verdict) -> Any:
+    """
+    Decode a single encoded object
+
+    :param data: encoded object
+    :param type_: model class (or union of them) the object should validate as
+    :raises DecodeError: if `data` is not a single complete object
+    """
+    try:
+        value, end = _unpack(data, 0)
+    except _OutOfData:
+        raise DecodeError('Truncated record')
+    if end != len(data):
+        raise DecodeError('Trailing data after record')
+    return _decode_value(value, type_)
+
+
+def write(fp: BinaryIO, records: Iterable[Schema], validate: bool = True) -> int:
+    """
+    Encode records to a binary file object
+
+    :return: number of records written
+    """
+    count = 0
+    for record in records:
+        fp.write(encode(record, validate=validate))
+        count += 1
+    return count
+
+
+def read(fp: BinaryIO, type_: Any = Verdict, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Lazily decode records from a binary file object, reading `chunk_size` bytes at a time
+
+    :raises DecodeError: if the stream ends partway through a record
+    """
+    buffer = bytearray()
+    offset = 0
+    # a partial record is only parsed again once the buffer holds the bytes it ran out at
+    needed = 1
+    while True:
+        if len(buffer) < needed:
+            # read at least as much as the partial record holds, so a large record is parsed a
+            # logarithmic number of times
+            chunk = fp.read(max(chunk_size, needed - len(buffer), len(buffer) - offset))
+            if not chunk:
+                if offset < len(buffer):
+                    raise DecodeError('Truncated record')
+                return
+            buffer += chunk
+            continue
+        try:
+            value, end = _unpack(buffer, offset)
+        except _OutOfData as e:
+            needed = e.needed
+            continue
+
+        offset = end
+        if offset >= chunk_size and offset * 2 >= len(buffer):
+            # drop decoded records once they make up most of the buffer
+            del buffer[:offset]
+            offset = 0
+        needed = offset + 1
+        yield _decode_value(value, type_)
@@ -1,14 +1,36 @@
-from typing import List, Optional, Union
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Union
 
 from pydantic import (
     AnyUrl,
     Field,
+    GetCoreSchemaHandler,
     PositiveInt,
     StrictStr,
-    RootModel
+    RootModel,
+    model_validator,
 )
 
-from .schema import MD5, SHA1, SHA256, Schema
+from pydantic.json_schema import SkipJsonSchema
+from pydantic_core import CoreSchema, core_schema
+
+from .. import content
+from .cache import LRUCache
+from .digest import DIGEST_LENGTHS, normalize_digests
+from .schema import (
+    MD5,
+    SHA1,
+    SHA256,
+    BatchResult,
+    MD5Bytes,
+    Schema,
+    SHA1Bytes,
+    SHA256Bytes,
+    get_adapter,
+    validate_many,
+)
 
 
 class FileArtifact(Schema):
@@ -19,36 +41,288 @@ class FileArtifact(Schema):
     sha1: Optional[SHA1] = Field(title='SHA1', default=None)
     md5: Optional[MD5] = Field(title='MD5', default=None)
 
+    @classmethod
+    def from_digest_bytes(
+        cls,
+        mimetype: str,
+        sha256: Optional[bytes] = None,
+        sha1: Optional[bytes] = None,
+        md5: Optional[bytes] = None,
+        **kwargs,
+    ) -> 'FileArtifact':
+        """
+        Construct from raw digests, such as the output of hashlib's ``digest()``
+        """
+        for field, digest in (('sha256', sha256), ('sha1', sha1), ('md5', md5)):
+            if digest is not None:
+                kwargs[field] = cls._digest_from_bytes(digest)
+        return cls(mimetype=mimetype, **kwargs)
+
+    @classmethod
+    def from_path(cls, path: Union[str, 'os.PathLike[str]'], **kwargs) -> 'FileArtifact':
+        """
+        Construct from a file on disk, reading it once to compute its digests, size and mimetype
+
+        The filename defaults to the file's base name. Keyword arguments override the computed filename,
+        filesize and mimetype.
+        """
+        return cls._from_content(path, content.scan(path), **kwargs)
+
+    @classmethod
+    def _from_content(cls, path: Union[str, 'os.PathLike[str]'], info: content.ContentInfo, **kwargs):
+        kwargs.setdefault('filename', os.path.basename(path))
+        if info.filesize:
+            kwargs.setdefault('filesize', info.filesize)
+        return cls.from_digest_bytes(
+            mimetype=kwargs.pop('mimetype', info.mimetype),
+            sha256=info.sha256,
+            sha1=info.sha1,
+            md5=info.md5,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _digest_from_bytes(digest: bytes):
+        return digest.hex()
+
+
+class CompactFileArtifact(FileArtifact):
+    """
+    FileArtifact that keeps its digests as raw bytes rather than hex strings, saving over 100 bytes per artifact
+
+    Digests are accepted as hex or bytes. Like a FileArtifact, reading or serializing `sha256`, `sha1`
+    or `md5` gives lowercase hex, while `sha256_bytes`, `sha1_bytes` and `md5_bytes` give the raw bytes.
+    """
+    sha256: Optional[SHA256Bytes] = Field(title='SHA256', default=None)
+    sha1: Optional[SHA1Bytes] = Field(title='SHA1', default=None)
+    md5: Optional[MD5Bytes] = Field(title='MD5', default=None)
+
+    @property
+    def sha256_bytes(self) -> Optional[bytes]:
+        return self.__dict__['sha256']
+
+    @property
+    def sha1_bytes(self) -> Optional[bytes]:
+        return self.__dict__['sha1']
+
+    @property
+    def md5_bytes(self) -> Optional[bytes]:
+        return self.__dict__['md5']
+
+    @staticmethod
+    def _digest_from_bytes(digest: bytes):
+        return digest
+
+    def _equals_dict(self, other):
+        # compare against the serialized hex digests rather than the stored bytes
+        return self.model_dump(exclude_defaults=True) == other
+
+
+def _hex_digest(field: str) -> property:
+    """
+    Property exposing the raw digest stored in `field` as hex, validating digests assigned to it
+    """
+    def get(self) -> Optional[str]:
+        digest = self.__dict__[field]
+        return None if digest is None else digest.hex()
+
+    def set(self, value: Any):
+        self.__pydantic_validator__.validate_assignment(self, field, value)
+
+    return property(get, set)
+
+
+# set once the class is created, since pydantic does not allow attributes to shadow fields in the class body.
+# Instances keep field values in __dict__, which validation and serialization use directly
+for _field in ('sha256', 'sha1', 'md5'):
+    setattr(CompactFileArtifact, _field, _hex_digest(_field))
+
+
+# parsed URLs by URL string, shared between calls since URLs are immutable
+URL_CACHE_SIZE = 4096
+_url_cache = LRUCache(URL_CACHE_SIZE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _uri_with_protocol(uri: str, protocol: Optional[str]) -> str:
+    """
+    Replace the scheme of `uri` (or add one) with `protocol`, given as ``https`` or ``https://``
+    """
+    if protocol is None:
+        return uri
+    proto, *_ = protocol.rsplit('://', 1)
+    return '{}://{}'.format(proto, uri.split('://', 1)[-1])
+
 
 class URLArtifact(Schema):
     # protocol can actually be derived directly from `uri`, we keep it here to preserve a
-    # preexisting interface.
-    protocol: Optional[str]
+    # preexisting interface. Defaults to the scheme of `uri`, as ``https://``
+    protocol: Optional[str] = None
     uri: AnyUrl = ...
 
-    def __post_init__(self):
+    @model_validator(mode='after')
+    def _default_protocol(self):
         if self.protocol is None:
-            self.protocol = self.uri.protocol
+            self.protocol = '{}://'.format(self.uri.scheme)
+        return self
+
+    @classmethod
+    def validate_urls(cls, uris: Iterable[str], protocol: Optional[str] = None) -> BatchResult:
+        """
+        Validate many URLs as URL artifacts in a single call
+
+        The most recently validated URLs are cached by string, so repeated URLs, in this batch or recent
+        ones, are only parsed once.
+
+        :param uris: URLs, with or without a scheme when `protocol` is given
+        :param protocol: replaces the scheme of every URL, see :meth:`Bounty.add_url_artifact`
+        :return: BatchResult with a URLArtifact per valid URL and a per-index error report
+        """
+        normalized = [_uri_with_protocol(uri, protocol) if isinstance(uri, str) else uri for uri in uris]
+        urls: Dict[str, Optional[AnyUrl]] = {}
+        for uri in normalized:
+            if isinstance(uri, str) and uri not in urls:
+                urls[uri] = _url_cache.get(uri)
+        # validate each distinct URL not seen before, all in one call
+        misses = [uri for uri, url in urls.items() if url is None]
+        parsed, failures = validate_many(AnyUrl, misses, json=False)
+        for uri, url in zip(misses, parsed):
+            if url is not None:
+                _url_cache.put(uri, url)
+                urls[uri] = url
+        failed = {misses[index]: errors for index, errors in failures.items()}
+
+        results: List[Optional[URLArtifact]] = []
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        for index, uri in enumerate(normalized):
+            if isinstance(uri, AnyUrl):
+                url = uri
+            elif isinstance(uri, str):
+                url = urls[uri]
+            else:
+                results.append(None)
+                errors[index] = [{'type': 'url_type', 'loc': ('uri',), 'msg': 'URL input should be a string or URL'}]
+                continue
+            if url is None:
+                results.append(None)
+                errors[index] = [{**error, 'loc': ('uri', *error['loc'])} for error in failed[uri]]
+                continue
+
+            # the fields are already validated, so skip BaseModel.__init__ as model_construct() does
+            artifact = cls.__new__(cls)
+            object.__setattr__(artifact, '__dict__', {'protocol': protocol or '{}://'.format(url.scheme), 'uri': url})
+            object.__setattr__(artifact, '__pydantic_fields_set__', {'protocol', 'uri'})
+            object.__setattr__(artifact, '__pydantic_extra__', None)
+            object.__setattr__(artifact, '__pydantic_private__', None)
+            results.append(artifact)
+        return BatchResult(results, errors)
+
+
+class _ExistingInstance:
+    """
+    Accepts only existing instances of the annotated model, which still serialize as that model
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> CoreSchema:
+        schema = core_schema.is_instance_schema(source)
+        schema['serialization'] = core_schema.wrap_serializer_function_ser_schema(
+            lambda value, serialize: serialize(value), schema=handler(source),
+        )
+        return schema
+
+
+# CompactFileArtifact is an in-memory representation only: existing instances are kept, but payloads never
+# validate into one and it is not part of the published schema
+Artifact = Union[FileArtifact, URLArtifact, SkipJsonSchema[Annotated[CompactFileArtifact, _ExistingInstance]]]
 
 
 class Bounty(RootModel, Schema):
-    root: List[Union[FileArtifact, URLArtifact]] = Field(min_items=1, max_items=256, default=[])
+    root: List[Artifact] = Field(min_items=1, max_items=256, default=[])
+
+    @classmethod
+    def validate_artifacts(cls, items) -> BatchResult:
+        """
+        Validate a batch of file or URL artifact payloads
+
+        See :func:`~polyswarmartifact.schema.schema.validate_many`
+        """
+        return validate_many(Artifact, items)
 
     @property
     def artifacts(self):
         return self.root
 
-    def add_file_artifact(self, **kwargs):
-        self.root.append(FileArtifact(**kwargs))
+    @classmethod
+    def from_file_artifacts(cls, artifacts: Iterable[Dict[str, Any]]) -> 'Bounty':
+        """
+        Build a bounty from many file artifact payloads at once
+
+        Digests are checked and lowercased as whole columns by :func:`normalize_digests`, instead of
+        matching a pattern per digest per artifact.
+
+        :raises ValueError: if any artifact is invalid
+        """
+        artifacts = [dict(artifact) for artifact in artifacts]
+        digests = {}
+        for field, length in DIGEST_LENGTHS.items():
+            normalized, mask = normalize_digests([artifact.pop(field, None) for artifact in artifacts], length)
+            if not all(mask):
+                invalid = [index for index, valid in enumerate(mask) if not valid]
+                raise ValueError('Invalid {} for file artifacts {}'.format(field, invalid))
+            digests[field] = normalized
+
+        validated = get_adapter(List[FileArtifact]).validate_python(artifacts)
+        for field, values in digests.items():
+            for artifact, value in zip(validated, values):
+                if value is not None:
+                    # already validated, so skip BaseModel.__setattr__
+                    artifact.__dict__[field] = value
+                    artifact.__pydantic_fields_set__.add(field)
+        return cls(validated)
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Iterable[Union[str, 'os.PathLike[str]']],
+        workers: Optional[int] = None,
+        compact: bool = False,
+    ) -> 'Bounty':
+        """
+        Build a bounty of file artifacts from files on disk, see :meth:`FileArtifact.from_path`
+
+        Files are read and hashed concurrently in a thread pool, which scales across cores since
+        hashlib releases the GIL on large buffers. Artifacts keep the order of `paths`.
+
+        :param workers: threads hashing files, defaults to the executor's default
+        :param compact: build CompactFileArtifacts
+        """
+        paths = list(paths)
+        artifact = CompactFileArtifact if compact else FileArtifact
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            infos = list(executor.map(content.scan, paths))
+        return cls([artifact._from_content(path, info) for path, info in zip(paths, infos)])
+
+    def add_file_artifact(self, compact: bool = False, **kwargs):
+        self.root.append((CompactFileArtifact if compact else FileArtifact)(**kwargs))
         return self
 
     def add_url_artifact(self, uri: str = None, protocol: str = None):
         if uri is None:
             raise ValueError
-        if protocol is not None:
-            proto, *_ = protocol.rsplit('://', 1)
-            uri = '{}://{}'.format(proto, next(reversed(uri.split('://', 1))))
-        self.root.append(URLArtifact(uri=str(uri), protocol=protocol))
+        self.root.append(URLArtifact(uri=_uri_with_protocol(str(uri), protocol), protocol=protocol))
+        return self
+
+    def add_url_artifacts(self, uris: Iterable[str], protocol: Optional[str] = None):
+        """
+        Add many URL artifacts at once, see :meth:`URLArtifact.validate_urls`
+
+        :raises ValueError: if any URL is invalid, in which case none are added
+        """
+        results, errors = URLArtifact.validate_urls(uris, protocol)
+        if errors:
+            raise ValueError('Invalid URL artifacts {}'.format(list(errors)))
+        self.root.extend(results)
         return self
 
     def __iter__(self):
@@ -0,0 +1,232 @@
+"""
+Optional content-addressed cache of validated models, so duplicate payloads skip validation
+
+Payloads are keyed by a hash of their encoded form. Every caller gets its own copy of the cached
+model, so models can be modified as usual.
+"""
+import copy
+import hashlib
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from pydantic import AnyUrl, BaseModel
+from pydantic_core import PydanticSerializationError, to_json
+
+from .schema import RawJSON, get_adapter
+
+# values copies share with the cached model, since they cannot be modified in place
+_SHARED = (str, int, float, type(None), bytes, RawJSON, AnyUrl, ipaddress.IPv4Address, ipaddress.IPv6Address)
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts its least recently used entries, and entries older than `ttl`
+
+    Safe to share between threads. Subclass to change the policy, e.g. override :meth:`_evict` to pick a
+    different victim.
+
+    :param maxsize: entries held before evicting
+    :param ttl: seconds an entry stays valid, or None to keep entries until evicted
+    :param clock: monotonic time source, in seconds
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # called with the key and value of every entry dropped from the cache
+        self.on_evict: Optional[Callable[[Hashable, Any], None]] = None
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, Optional[float]]]' = OrderedDict()
+        # reentrant, so on_evict callbacks may use the cache
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value, expires = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= self.clock():
+                self.expirations += 1
+                self.misses += 1
+                self._drop(key)
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get an unexpired entry without counting a hit or miss, or marking it as recently used
+        """
+        with self._lock:
+            try:
+                value, expires = self._entries[key]
+            except KeyError:
+                return default
+            return default if expires is not None and expires <= self.clock() else value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            expires = None if self.ttl is None else self.clock() + self.ttl
+            self._entries[key] = (value, expires)
+            while len(self._entries) > self.maxsize:
+                self._evict()
+
+    def _evict(self):
+        key = next(iter(self._entries))
+        self.evictions += 1
+        self._drop(key)
+
+    def _drop(self, key: Hashable):
+        value, _ = self._entries.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+def copy_validated(value: Any) -> Any:
+    """
+    Deep copy of a validated value, sharing immutable leaves such as strings and URLs
+
+    Much faster than ``model_copy(deep=True)``, which goes through :func:`copy.deepcopy`.
+    """
+    if isinstance(value, _SHARED):
+        return value
+    if type(value) is list:
+        return [copy_validated(item) for item in value]
+    if type(value) is dict:
+        return {key: copy_validated(item) for key, item in value.items()}
+    if isinstance(value, BaseModel):
+        copied = type(value).__new__(type(value))
+        object.__setattr__(copied, '__dict__', {key: copy_validated(item) for key, item in value.__dict__.items()})
+        object.__setattr__(copied, '__pydantic_fields_set__', set(value.__pydantic_fields_set__))
+        object.__setattr__(copied, '__pydantic_extra__', copy_validated(value.__pydantic_extra__))
+        object.__setattr__(copied, '__pydantic_private__', copy_validated(value.__pydantic_private__))
+        return copied
+    return copy.deepcopy(value)
+
+
+def payload_key(type_: Any, data: Any) -> Tuple[Any, bytes]:
+    """
+    Cache key of a payload validated as `type_`, from a hash of its encoded form
+
+    Dicts are encoded as they are, so the same payload with its keys in another order gets another key.
+    """
+    encoded = data if isinstance(data, (bytes, bytearray)) else \
+        data.encode('utf-8') if isinstance(data, str) else to_json(data)
+    return type_, hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class ValidationCache:
+    """
+    Maps payload hashes to validated models and, once serialized, to their JSON
+
+    Pass it as ``cache=`` to :meth:`Schema.model_validate` and :meth:`Schema.json`. Validation returns a
+    copy of the cached model, and cached JSON is only reused while that copy still equals it.
+
+    :param maxsize: payloads held before evicting, when `store` is not given
+    :param ttl: seconds a payload stays cached, when `store` is not given
+    :param store: LRUCache (or subclass) holding the entries
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None, store: Optional[LRUCache] = None):
+        self.store = store if store is not None else LRUCache(maxsize, ttl)
+        # id of each copy handed out -> its key. Ids may be reused once a copy is freed, which is harmless
+        # since get_json() compares the model against the cached one
+        self._keys = LRUCache(self.store.maxsize)
+
+    def __len__(self):
+        return len(self.store)
+
+    def validate(self, type_: Any, data: Any, json: Optional[bool] = None) -> Any:
+        """
+        Validate a payload as `type_`, unless the same payload is cached
+
+        :param json: whether the payload is JSON, by default when it is str or bytes. Otherwise str and
+            bytes payloads are validated as Python objects, and not cached
+        :raises ValidationError: if the payload is invalid, which is not cached
+        :return: a copy of the cached value, owned by the caller
+        """
+        adapter = get_adapter(type_)
+        encoded = isinstance(data, (bytes, bytearray, str))
+        if json is None:
+            json = encoded
+        if encoded and not json:
+            # their key would be that of the same JSON payload
+            return adapter.validate_python(data)
+        try:
+            key = payload_key(type_, data)
+        except PydanticSerializationError:
+            # not plain data, so there is nothing to key it by
+            return adapter.validate_python(data)
+
+        entry = self.store.get(key)
+        if entry is None:
+            model = adapter.validate_json(data) if json else adapter.validate_python(data)
+            entry = [model, None]
+            self.store.put(key, entry)
+        copied = copy_validated(entry[0])
+        self._keys.put(id(copied), key)
+        return copied
+
+    def _entry(self, model: Any) -> Optional[List[Any]]:
+        """
+        Cache entry `model` was copied from, if it has not been modified since
+        """
+        key = self._keys.peek(id(model))
+        if key is None:
+            return None
+        entry = self.store.peek(key)
+        if entry is None or type(entry[0]) is not type(model) or entry[0] != model:
+            return None
+        return entry
+
+    def get_json(self, model: Any) -> Optional[str]:
+        """
+        Cached JSON of a model returned by :meth:`validate`, if it was serialized with :meth:`put_json`
+        and has not been modified since
+        """
+        entry = self._entry(model)
+        return None if entry is None else entry[1]
+
+    def put_json(self, model: Any, output: str):
+        entry = self._entry(model)
+        if entry is not None:
+            entry[1] = output
+
+    def clear(self):
+        self.store.clear()
+        self._keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
@@ -0,0 +1,234 @@
+"""
+Column-wise container for many verdicts, grouped into assertions
+"""
+from array import array
+from bisect import bisect_right
+from typing import Any, BinaryIO, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Union
+
+from pydantic_core import from_json
+
+from ..exceptions import DecodeError
+from .assertion import Assertion
+from .schema import get_adapter
+from .view import _FIELD_SET, VerdictView
+
+# scanner fields copied into their own columns
+SCANNER_COLUMNS = {
+    'scanner_version': 'version',
+    'vendor_version': 'vendor_version',
+    'signatures_version': 'signatures_version',
+}
+
+_SCALAR_COLUMNS = ('malware_family', 'heuristic') + tuple(SCANNER_COLUMNS)
+
+
+class VerdictBatch:
+    """
+    Verdicts packed into one array per field
+
+    Row `i` is the `i`th verdict. `domains` and `ip_addresses` hold every row's values back to back,
+    with row `i`'s values between `domain_offsets[i]` and `domain_offsets[i + 1]`. Likewise, the
+    verdicts of assertion `j` are the rows between `assertion_offsets[j]` and `assertion_offsets[j + 1]`.
+
+    Like :class:`VerdictView`, nothing is validated until converting back with :meth:`to_assertions`.
+    """
+    __slots__ = _SCALAR_COLUMNS + ('stix', 'scanner', 'extra', 'domains', 'domain_offsets', 'ip_addresses',
+                                   'ip_address_offsets', 'assertion_offsets')
+
+    def __init__(self):
+        self.malware_family: List[Optional[str]] = []
+        self.heuristic: List[Optional[bool]] = []
+        self.scanner_version: List[Optional[str]] = []
+        self.vendor_version: List[Optional[str]] = []
+        self.signatures_version: List[Optional[str]] = []
+        self.stix: List[Optional[List[Dict[str, Any]]]] = []
+        self.scanner: List[Optional[Dict[str, Any]]] = []
+        self.extra: List[Optional[Dict[str, Any]]] = []
+        self.domains: List[str] = []
+        self.domain_offsets = array('q', [0])
+        self.ip_addresses: List[str] = []
+        self.ip_address_offsets = array('q', [0])
+        self.assertion_offsets = array('q', [0])
+
+    def __len__(self):
+        return len(self.malware_family)
+
+    def __getitem__(self, index: int) -> VerdictView:
+        return VerdictView.from_dict(self.row(index))
+
+    @property
+    def assertion_count(self) -> int:
+        return len(self.assertion_offsets) - 1
+
+    def _append(self, verdict: Dict[str, Any]):
+        if not isinstance(verdict, dict):
+            raise TypeError('verdict must be a dict, not {}'.format(type(verdict).__name__))
+        scanner = verdict.get('scanner')
+        self.malware_family.append(verdict.get('malware_family'))
+        self.heuristic.append(verdict.get('heuristic'))
+        for column, field in SCANNER_COLUMNS.items():
+            getattr(self, column).append(scanner.get(field) if isinstance(scanner, dict) else None)
+        self.stix.append(verdict.get('stix'))
+        self.scanner.append(scanner)
+        self.extra.append(
+            None if verdict.keys() <= _FIELD_SET else {k: v for k, v in verdict.items() if k not in _FIELD_SET}
+        )
+        self.domains.extend(verdict.get('domains') or ())
+        self.domain_offsets.append(len(self.domains))
+        self.ip_addresses.extend(verdict.get('ip_addresses') or ())
+        self.ip_address_offsets.append(len(self.ip_addresses))
+
+    def append_assertion(self, verdicts: Union[Assertion, Iterable[Dict[str, Any]]]) -> 'VerdictBatch':
+        """
+        Add the verdicts of one assertion, given as a model or as verdict dicts
+
+        :return: self
+        """
+        if isinstance(verdicts, Assertion):
+            verdicts = verdicts.model_dump(mode='json', by_alias=True, exclude_defaults=True)
+        for verdict in verdicts:
+            self._append(verdict)
+        self.assertion_offsets.append(len(self))
+        return self
+
+    @classmethod
+    def from_assertions(cls, assertions: Iterable[Union[Assertion, Iterable[Dict[str, Any]]]]) -> 'VerdictBatch':
+        batch = cls()
+        for assertion in assertions:
+            batch.append_assertion(assertion)
+        return batch
+
+    @classmethod
+    def from_verdicts(cls, verdicts: Iterable[Dict[str, Any]]) -> 'VerdictBatch':
+        """
+        Pack verdict dicts as a single assertion
+        """
+        return cls().append_assertion(verdicts)
+
+    @classmethod
+    def from_ndjson(cls, fp: BinaryIO) -> 'VerdictBatch':
+        """
+        Pack one record per line from a binary file object
+
+        A line holding a JSON array is an assertion, and a line holding a JSON object is a verdict
+        making up an assertion of its own.
+
+        :raises DecodeError: if a line is not a verdict or an array of verdicts
+        """
+        batch = cls()
+        for number, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = from_json(line)
+                batch.append_assertion([record] if isinstance(record, dict) else record)
+            except (ValueError, TypeError) as e:
+                raise DecodeError('Invalid record on line {}'.format(number)) from e
+        return batch
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        The verdict dict of row `index`, leaving out empty fields
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('row index out of range')
+
+        verdict: Dict[str, Any] = {}
+        if self.malware_family[index] is not None:
+            verdict['malware_family'] = self.malware_family[index]
+        domains = self.domains[self.domain_offsets[index]:self.domain_offsets[index + 1]]
+        if domains:
+            verdict['domains'] = domains
+        ip_addresses = self.ip_addresses[self.ip_address_offsets[index]:self.ip_address_offsets[index + 1]]
+        if ip_addresses:
+            verdict['ip_addresses'] = ip_addresses
+        for field in ('stix', 'scanner', 'heuristic'):
+            value = getattr(self, field)[index]
+            if value is not None:
+                verdict[field] = value
+        if self.extra[index]:
+            verdict.update(self.extra[index])
+        return verdict
+
+    def take(self, indices: Iterable[int]) -> 'VerdictBatch':
+        """
+        A new batch holding only the rows at `indices`, in increasing order
+
+        Every assertion is kept, so assertion `j` of the new batch holds the selected verdicts of
+        assertion `j` of this one.
+        """
+        batch = VerdictBatch()
+        ends = iter(self.assertion_offsets[1:])
+        end = next(ends, None)
+        for index in sorted(indices):
+            while end is not None and index >= end:
+                batch.assertion_offsets.append(len(batch))
+                end = next(ends, None)
+            batch._append(self.row(index))
+        while end is not None:
+            batch.assertion_offsets.append(len(batch))
+            end = next(ends, None)
+        return batch
+
+    def filter(
+        self,
+        malware_family: Optional[Union[str, Collection[Optional[str]]]] = None,
+        heuristic: Optional[bool] = None,
+        predicate: Optional[Callable[[VerdictView], bool]] = None,
+    ) -> 'VerdictBatch':
+        """
+        A new batch holding only the matching rows, see :meth:`take`
+
+        :param malware_family: keep rows with this malware family, or any of these families
+        :param heuristic: keep rows with this heuristic flag
+        :param predicate: keep rows for which this returns true, given a view of the row
+        """
+        indices: Iterable[int] = range(0, len(self))
+        if malware_family is not None:
+            families = {malware_family} if isinstance(malware_family, str) else set(malware_family)
+            indices = [i for i, family in enumerate(self.malware_family) if family in families]
+        if heuristic is not None:
+            flags = self.heuristic
+            indices = [i for i in indices if flags[i] is heuristic]
+        if predicate is not None:
+            indices = [i for i in indices if predicate(self[i])]
+        return self.take(indices)
+
+    def group_by(self, column: str = 'malware_family') -> Dict[Any, array]:
+        """
+        Row indices for each distinct value of a scalar column
+
+        :param column: one of malware_family, heuristic, scanner_version, vendor_version or signatures_version
+        """
+        if column not in _SCALAR_COLUMNS:
+            raise ValueError('Cannot group by {}'.format(column))
+        groups: Dict[Any, array] = {}
+        for index, value in enumerate(getattr(self, column)):
+            try:
+                groups[value].append(index)
+            except KeyError:
+                groups[value] = array('q', [index])
+        return groups
+
+    def assertion_of(self, index: int) -> int:
+        """
+        Index of the assertion holding row `index`
+        """
+        return bisect_right(self.assertion_offsets, index) - 1
+
+    def to_assertions(self) -> List[Assertion]:
+        """
+        Validate each assertion into a full Assertion
+
+        :raises ValidationError: if any assertion is not valid
+        """
+        adapter = get_adapter(Assertion)
+        offsets: Sequence[int] = self.assertion_offsets
+        return [
+            adapter.validate_python([self.row(index) for index in range(offsets[j], offsets[j + 1])])
+            for j in range(0, self.assertion_count)
+        ]
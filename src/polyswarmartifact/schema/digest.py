@@ -0,0 +1,49 @@
+"""
+Batch validation and normalization of hex digests
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+# FileArtifact digest fields and their hex lengths
+DIGEST_LENGTHS = {'sha256': 64, 'sha1': 40, 'md5': 32}
+
+_HEX = b'0123456789abcdef'
+
+
+def _normalize_digest(value: Any, length: int) -> Optional[str]:
+    if not isinstance(value, str) or len(value) != length or not value.isascii():
+        return None
+    value = value.lower()
+    if value.encode('ascii').translate(None, _HEX):
+        return None
+    return value
+
+
+def normalize_digests(values: Sequence[Optional[str]], length: int) -> Tuple[List[Optional[str]], List[bool]]:
+    """
+    Validate and lowercase a batch of hex digests that should all be `length` characters long
+
+    The whole batch is checked at once by joining it into a single buffer, only falling back to
+    checking digests one at a time when the batch holds an invalid one. ``None`` is a valid, absent
+    digest.
+
+    :return: the lowercased digests (``None`` where absent or invalid) and a validity mask
+    """
+    present = [value for value in values if value is not None]
+    try:
+        blob = ''.join(present).encode('ascii').lower()
+    except (TypeError, UnicodeEncodeError):
+        blob = None
+
+    if blob is not None and len(blob) == length * len(present) and not blob.translate(None, _HEX):
+        if all(map(length.__eq__, map(len, present))):
+            text = blob.decode('ascii')
+            digests = iter([text[offset:offset + length] for offset in range(0, len(text), length)])
+            return [None if value is None else next(digests) for value in values], [True] * len(values)
+
+    normalized = []
+    mask = []
+    for value in values:
+        digest = None if value is None else _normalize_digest(value, length)
+        normalized.append(digest)
+        mask.append(value is None or digest is not None)
+    return normalized, mask
@@ -0,0 +1,84 @@
+"""
+Opt-in interning for strings that repeat across many decoded objects, such as malware families
+
+Interning is off by default. Once enabled, every validated occurrence of an interned field shares a
+single string object from a process-wide, bounded table.
+"""
+from typing import Annotated, Dict, Optional
+
+from pydantic import AfterValidator
+
+
+class InternTable:
+    """
+    Bounded string intern table
+
+    Once `maxsize` strings are held, new strings are passed through without being stored.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value: str) -> str:
+        try:
+            interned = self._strings[value]
+        except KeyError:
+            self.misses += 1
+            if len(self._strings) < self.maxsize:
+                self._strings[value] = value
+            else:
+                self.rejected += 1
+            return value
+        self.hits += 1
+        return interned
+
+    def clear(self):
+        self._strings.clear()
+        self.hits = self.misses = self.rejected = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._strings),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'rejected': self.rejected,
+        }
+
+
+_table: Optional[InternTable] = None
+
+
+def enable_interning(maxsize: int = 65536) -> InternTable:
+    """
+    Start interning string fields on validation, replacing any existing table
+
+    :return: the process-wide intern table
+    """
+    global _table
+    _table = InternTable(maxsize)
+    return _table
+
+
+def disable_interning():
+    global _table
+    _table = None
+
+
+def get_intern_table() -> Optional[InternTable]:
+    return _table
+
+
+def intern_string(value: str) -> str:
+    table = _table
+    return value if table is None else table.intern(value)
+
+
+InternedStr = Annotated[str, AfterValidator(intern_string)]
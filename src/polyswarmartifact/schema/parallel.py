@@ -0,0 +1,192 @@
+"""
+Parallel validation of large NDJSON and JSON array files across worker processes
+"""
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schema import BatchResult, get_adapter, validate_many
+from .verdict import Verdict
+
+# chunks handed to each worker, so uneven chunks still balance out
+CHUNKS_PER_WORKER = 4
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+
+def _nested(depth: int) -> bytes:
+    """
+    Pattern of JSON text with brackets and braces balanced up to `depth` levels deep
+    """
+    inner = rb'[^"\[\]{}]*(?:' + _STRING + rb'[^"\[\]{}]*)*'
+    for _ in range(depth):
+        inner = rb'[^"\[\]{}]*(?:(?:' + _STRING + rb'|[\[{]' + inner + rb'[\]}])[^"\[\]{}]*)*'
+    return inner
+
+
+# levels of nesting within an array item matched by _ITEM. Deeper items are walked through _STRUCTURE
+ITEM_DEPTH = 8
+
+_ARRAY_START = re.compile(rb'\s*\[')
+# a JSON array item, up to the comma or bracket ending it
+_ITEM = re.compile(rb'[^"\[\]{},]*(?:(?:' + _STRING + rb'|[\[{]' + _nested(ITEM_DEPTH) + rb'[\]}])[^"\[\]{},]*)*')
+# anything but JSON structure, strings included, up to the next structural character
+_STRUCTURE = re.compile(rb'[^"\[\]{},]*(?:' + _STRING + rb'[^"\[\]{},]*)*([\[\]{},])')
+
+
+def _encode(type_: Any, result: BatchResult) -> BatchResult:
+    adapter = get_adapter(type_)
+    return BatchResult(
+        [None if value is None else adapter.dump_json(value, by_alias=True, exclude_defaults=True)
+         for value in result.results],
+        result.errors,
+    )
+
+
+def _read_lines(path: str, start: int, end: int) -> List[bytes]:
+    """
+    Non-empty lines starting within [start, end) of the file
+    """
+    with open(path, 'rb') as f:
+        if start:
+            # the line crossing `start` belongs to the previous chunk
+            f.seek(start - 1)
+            f.readline()
+        lines = []
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if line:
+                lines.append(line)
+        return lines
+
+
+def _item_end(data: Any, position: int) -> int:
+    """
+    Position of the comma or bracket ending the array item starting at `position`
+    """
+    end = _ITEM.match(data, position).end()
+    if data[end:end + 1] in (b',', b']'):
+        return end
+    # nested deeper than _ITEM matches, or malformed
+    depth = 0
+    while True:
+        match = _STRUCTURE.match(data, position)
+        if match is None:
+            raise ValueError('Unterminated JSON array')
+        char, position = data[match.start(1)], match.end()
+        if char in b'[{':
+            depth += 1
+        elif not depth:
+            return match.start(1)
+        elif char in b']}':
+            depth -= 1
+
+
+def _array_ranges(data: Any, count: int) -> List[Tuple[int, int]]:
+    """
+    Split the items of the JSON array in `data` into about `count` byte ranges
+
+    Each range holds whole items separated by commas, without the enclosing brackets.
+
+    :raises ValueError: if `data` does not hold a JSON array
+    """
+    match = _ARRAY_START.match(data)
+    if match is None:
+        raise ValueError('Expected a JSON array')
+    step = max(1, -(-len(data) // count))
+    ranges = []
+    start = position = match.end()
+    while True:
+        position = _item_end(data, position)
+        char = data[position]
+        if char == ord(']'):
+            break
+        if char != ord(','):
+            raise ValueError('Malformed JSON array')
+        if position - start >= step:
+            ranges.append((start, position))
+            start = position + 1
+        position += 1
+    ranges.append((start, position))
+    if data[position + 1:].strip():
+        raise ValueError('Unexpected data after the JSON array')
+    return ranges
+
+
+def _read_items(path: str, start: int, end: int) -> bytes:
+    """
+    JSON array of the items within [start, end) of the file
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return b'[' + f.read(end - start) + b']'
+
+
+def _validate_range(type_: Any, path: str, start: int, end: int) -> BatchResult:
+    return _encode(type_, validate_many(type_, _read_lines(path, start, end)))
+
+
+def _validate_items(type_: Any, path: str, start: int, end: int) -> BatchResult:
+    return _encode(type_, validate_many(type_, _read_items(path, start, end)))
+
+
+def _merge(results: List[BatchResult]) -> BatchResult:
+    merged: List[Optional[bytes]] = []
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    for result in results:
+        errors.update((len(merged) + index, failures) for index, failures in result.errors.items())
+        merged.extend(result.results)
+    return BatchResult(merged, errors)
+
+
+def _ranges(size: int, count: int) -> List[Tuple[int, int]]:
+    step = max(1, -(-size // count))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def validate_ndjson(
+    path: str,
+    type_: Any = Verdict,
+    workers: Optional[int] = None,
+    array: Optional[bool] = None,
+) -> BatchResult:
+    """
+    Validate every record of a file in worker processes
+
+    Files are split into byte ranges, which each worker reads and validates itself. NDJSON ranges are
+    aligned to line starts. JSON array files are scanned in this process for the boundaries between
+    items, without parsing them.
+
+    :param path: file to validate
+    :param type_: model class (or union of them) each record should validate as
+    :param workers: number of worker processes, defaults to the CPU count. With 1, validates in this process
+    :param array: whether the file holds one JSON array rather than NDJSON, defaults to true for ``.json`` files
+    :return: BatchResult with each valid record re-encoded as compact JSON bytes (by alias, without
+        defaults), in file order, and errors keyed by record index. Blank lines are not records
+    :raises ValueError: if an array file does not hold a JSON array
+    """
+    workers = workers or os.cpu_count() or 1
+    if array is None:
+        array = path.endswith('.json')
+
+    if array:
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                raise ValueError('Expected a JSON array')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = _array_ranges(data, workers * CHUNKS_PER_WORKER)
+        tasks = [(_validate_items, type_, path, start, end) for start, end in ranges]
+    else:
+        ranges = _ranges(os.path.getsize(path), workers * CHUNKS_PER_WORKER)
+        tasks = [(_validate_range, type_, path, start, end) for start, end in ranges]
+
+    if workers == 1:
+        return _merge([fn(*args) for fn, *args in tasks])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fn, *args) for fn, *args in tasks]
+        return _merge([future.result() for future in futures])
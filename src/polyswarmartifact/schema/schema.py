@@ -1,32 +1,208 @@
 import functools
+import hashlib
+import json
 import logging
+import os
+import re
+import secrets
 from contextlib import contextmanager
 from typing import (
+    Annotated,
     Any,
+    AnyStr,
     Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
     Type,
     Union,
     cast,
 )
 from pydantic.fields import FieldInfo
-from pydantic import BaseModel, ValidationError, constr, ConfigDict
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PlainSerializer,
+    PlainValidator,
+    StringConstraints,
+    TypeAdapter,
+    ValidationError,
+    WithJsonSchema,
+    constr,
+)
+from pydantic.version import VERSION as PYDANTIC_VERSION
+from pydantic_core import PydanticUndefined, SchemaSerializer, core_schema, from_json, to_json
+from pydantic_core.core_schema import SerializationInfo
+
+from .. import __version__
 
 logger = logging.getLogger(__name__)
 
 MD5 = constr(pattern='^[0-9a-fA-F]{32}$', min_length=32, max_length=32)
 SHA1 = constr(pattern='^[0-9a-fA-F]{40}$', min_length=40, max_length=40)
 SHA256 = constr(pattern='^[0-9a-fA-F]{64}$', min_length=64, max_length=64)
-Domain = constr(
-    pattern=r'(?:{int_chunk}\.)*?{int_chunk}{int_domain_ending}'.format(
-        int_chunk=r'[_0-9a-\U00040000](?:[-_0-9a-\U00040000]{0,61}[_0-9a-\U00040000])?',
-        int_domain_ending=r'(?P<tld>(\.[^\W\d_]{2,63})|(\.(?:xn--)[_0-9a-z-]{2,63}))?\.?',
-    ),
-    min_length=3,
-    max_length=61 + 63 + 3
+
+
+def _digest_bytes(size: int) -> Callable[[Any], bytes]:
+    def validate(value: Any) -> bytes:
+        if isinstance(value, str):
+            # bytes.fromhex() skips whitespace, so check the exact length first
+            try:
+                if len(value) != size * 2:
+                    raise ValueError
+                value = bytes.fromhex(value)
+            except ValueError:
+                raise ValueError('digest should be {} hex characters'.format(size * 2))
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+        else:
+            raise ValueError('digest should be bytes or a hex string')
+        if len(value) != size:
+            raise ValueError('digest should be {} bytes'.format(size))
+        return value
+
+    return validate
+
+
+def _hex_json_schema(length: int) -> Dict[str, Any]:
+    return {
+        'type': 'string',
+        'pattern': '^[0-9a-fA-F]{{{}}}$'.format(length),
+        'minLength': length,
+        'maxLength': length,
+    }
+
+
+# raw digests, accepting hex or bytes and serialized as lowercase hex
+MD5Bytes = Annotated[bytes, PlainValidator(_digest_bytes(16)), PlainSerializer(bytes.hex, return_type=str),
+                     WithJsonSchema(_hex_json_schema(32))]
+SHA1Bytes = Annotated[bytes, PlainValidator(_digest_bytes(20)), PlainSerializer(bytes.hex, return_type=str),
+                      WithJsonSchema(_hex_json_schema(40))]
+SHA256Bytes = Annotated[bytes, PlainValidator(_digest_bytes(32)), PlainSerializer(bytes.hex, return_type=str),
+                        WithJsonSchema(_hex_json_schema(64))]
+
+# the pattern domains have always been published with. It is not anchored and all but its first character is
+# optional, so it matches any string holding one of those characters. Validating with that single character
+# class instead accepts exactly the same strings, without a lazy group to backtrack on
+DOMAIN_PATTERN = r'(?:{int_chunk}\.)*?{int_chunk}{int_domain_ending}'.format(
+    int_chunk=r'[_0-9a-\U00040000](?:[-_0-9a-\U00040000]{0,61}[_0-9a-\U00040000])?',
+    int_domain_ending=r'(?P<tld>(\.[^\W\d_]{2,63})|(\.(?:xn--)[_0-9a-z-]{2,63}))?\.?',
 )
+DOMAIN_CHAR_PATTERN = r'[_0-9a-\U00040000]'
+
+Domain = Annotated[
+    str,
+    StringConstraints(pattern=DOMAIN_CHAR_PATTERN, min_length=3, max_length=61 + 63 + 3),
+    WithJsonSchema({'maxLength': 61 + 63 + 3, 'minLength': 3, 'pattern': DOMAIN_PATTERN, 'type': 'string'}),
+]
 VersionStr = constr(pattern=r"^[0-9]+([.][0-9]+)*$")
 
 
+class RawJSON:
+    """
+    A JSON value kept as its original encoded bytes, parsed only when first accessed
+
+    ``Schema.json()`` writes the bytes through, after checking once that they are well-formed unless
+    called with ``validate=False``. Line breaks are dropped, so records stay on one line in NDJSON.
+    """
+    __slots__ = ('raw', '_value', '_checked')
+
+    _unparsed = object()
+
+    def __init__(self, raw: Union[bytes, bytearray, memoryview, str]):
+        raw = raw.encode('utf-8') if isinstance(raw, str) else bytes(raw)
+        # valid JSON only has line breaks as whitespace between tokens, never within strings
+        self.raw = raw.replace(b'\r', b'').replace(b'\n', b'')
+        self._value = self._unparsed
+        self._checked = False
+
+    @property
+    def parsed(self) -> bool:
+        return self._value is not self._unparsed
+
+    @property
+    def value(self) -> Any:
+        if self._value is self._unparsed:
+            self._value = from_json(self.raw)
+        return self._value
+
+    def check(self) -> 'RawJSON':
+        """
+        Check that the bytes are well-formed JSON, without keeping the parsed value
+
+        :raises ValueError: if they are not
+        """
+        if not self._checked and self._value is self._unparsed:
+            from_json(self.raw)
+        self._checked = True
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, RawJSON):
+            return self.raw == other.raw or self.value == other.value
+        return self.value == other
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return 'RawJSON({!r})'.format(self.raw)
+
+    def __reduce__(self):
+        # copies and pickles start out unparsed, since the sentinel is not preserved
+        return type(self), (self.raw,)
+
+
+def validate_raw_json(value: Any) -> Any:
+    """
+    Check RawJSON values, passing anything else through
+    """
+    if isinstance(value, RawJSON):
+        value.check()
+    return value
+
+
+def serialize_raw_json(value: RawJSON, info: SerializationInfo) -> Any:
+    """
+    Serializer of RawJSON values
+
+    Values are parsed on serialization unless :meth:`Schema.json` or :meth:`Schema.dict` asked, through
+    the serialization context, to keep them raw.
+    """
+    context = info.context
+    if not context:
+        return value.value
+    if 'raw_json' in context:
+        # emit a placeholder, replaced with the raw bytes once the whole object is encoded
+        placeholders = context['raw_json']
+        placeholders.append(value.raw)
+        nonce = context.setdefault('raw_json_nonce', secrets.token_hex(8))
+        return 'raw-json-{}-{}'.format(nonce, len(placeholders) - 1)
+    if context.get('keep_raw_json') and info.mode == 'python':
+        return value
+    return value.value
+
+
+# fields typed Any serialize parsed values without calling into Python, and hand RawJSON values to this
+RawJSON.__pydantic_serializer__ = SchemaSerializer(  # type: ignore
+    core_schema.any_schema(serialization=core_schema.plain_serializer_function_ser_schema(serialize_raw_json,
+                                                                                          info_arg=True)),
+)
+
+
+def _splice_raw_json(output: AnyStr, context: Dict[str, Any]) -> AnyStr:
+    placeholders = context['raw_json']
+    if not placeholders:
+        return output
+    pattern = r'"raw-json-{}-(\d+)"'.format(context['raw_json_nonce'])
+    if isinstance(output, bytes):
+        return re.sub(pattern.encode('ascii'), lambda match: placeholders[int(match.group(1))], output)
+    return re.sub(pattern, lambda match: placeholders[int(match.group(1))].decode('utf-8'), output)
+
+
 def chainable(fn: Callable):
     """
     Decorator to validate the arguments passed to a function, returning self
@@ -40,6 +216,157 @@ def chainable(fn: Callable):
     return setter_wrapper
 
 
+class BatchResult(NamedTuple):
+    """
+    Outcome of validating a batch of payloads
+
+    ``results`` holds one entry per input, ``None`` where the input failed.
+    ``errors`` maps the index of each failed input to its compact error list
+    """
+    results: List[Optional[Any]]
+    errors: Dict[int, List[Dict[str, Any]]]
+
+
+@functools.lru_cache(maxsize=None)
+def get_adapter(type_: Any) -> TypeAdapter:
+    """
+    Get a TypeAdapter for `type_`, built only once per type
+    """
+    return TypeAdapter(type_)
+
+
+def _compact_errors(errors: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{'type': e['type'], 'loc': e['loc'], 'msg': e['msg']} for e in errors]
+
+
+def validate_many(type_: Any, items: Union[bytes, str, Iterable[Any]], json: bool = True) -> BatchResult:
+    """
+    Validate a batch of payloads against `type_` in a single call
+
+    :param type_: model class (or union of them) each item should validate as
+    :param items: a JSON array, or an iterable of dicts and/or JSON encoded items
+    :param json: whether str and bytes items are JSON. Otherwise they are validated as they are, e.g. URLs
+    :return: BatchResult with the validated items and a per-index error report
+    """
+    if isinstance(items, (bytes, bytearray, str)):
+        items = from_json(items)
+
+    values: List[Any] = []
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    for index, item in enumerate(items):
+        if json and isinstance(item, (bytes, bytearray, str)):
+            try:
+                item = from_json(item)
+            except ValueError as e:
+                errors[index] = [{'type': 'json_invalid', 'loc': (), 'msg': str(e)}]
+        values.append(item)
+
+    adapter = get_adapter(List[type_])
+    pending = [index for index in range(len(values)) if index not in errors]
+    try:
+        validated = adapter.validate_python([values[index] for index in pending])
+    except ValidationError as e:
+        failed: Dict[int, List[Dict[str, Any]]] = {}
+        for error in e.errors(include_url=False):
+            position, *loc = error['loc']
+            failed.setdefault(pending[position], []).append({**error, 'loc': tuple(loc)})
+        errors.update((index, _compact_errors(failures)) for index, failures in failed.items())
+        # items validate independently, so the rest of the batch now passes in one more call
+        pending = [index for index in pending if index not in failed]
+        validated = adapter.validate_python([values[index] for index in pending])
+
+    results: List[Optional[Any]] = [None] * len(values)
+    for index, value in zip(pending, validated):
+        results[index] = value
+    return BatchResult(results, dict(sorted(errors.items())))
+
+
+SCHEMA_CACHE_ENV = 'POLYSWARMARTIFACT_SCHEMA_CACHE'
+
+# model class -> (core schema the JSON schema was generated from, JSON schema, encoded JSON schema)
+_schema_cache: Dict[type, Tuple[Any, bytes]] = {}
+
+
+def _schema_cache_path(cls: type) -> Optional[str]:
+    directory = os.environ.get(SCHEMA_CACHE_ENV)
+    if not directory:
+        return None
+    filename = '{}.{}-{}-pydantic-{}.json'.format(cls.__module__, cls.__qualname__, __version__, PYDANTIC_VERSION)
+    return os.path.join(directory, filename)
+
+
+def _load_json_schema(cls: Type[BaseModel]) -> bytes:
+    """
+    Generate the JSON schema for `cls` as JSON, going through the on-disk cache when one is configured
+    """
+    path = _schema_cache_path(cls)
+    if path is not None:
+        try:
+            with open(path, 'rb') as f:
+                schema_bytes = f.read()
+            # make sure the cached file still parses
+            from_json(schema_bytes)
+            return schema_bytes
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning('Ignoring unreadable schema cache %s: %s', path, e)
+
+    schema_bytes = to_json(cls.model_json_schema())
+    if path is not None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file first so concurrent workers never read a partial schema
+            temporary = '{}.{}.tmp'.format(path, os.getpid())
+            with open(temporary, 'wb') as f:
+                f.write(schema_bytes)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning('Unable to write schema cache %s: %s', path, e)
+    return schema_bytes
+
+
+# keyword arguments for model_dump() by profile name, see Schema.dump()
+SERIALIZATION_PROFILES: Dict[str, Dict[str, Any]] = {
+    'wire': {'by_alias': True, 'exclude_defaults': True},
+    'storage': {'by_alias': True},
+}
+
+# (model class, profile) -> (serializer the profile was compiled for, serializer keyword arguments)
+_profile_cache: Dict[Tuple[type, str], Tuple[Any, Dict[str, Any]]] = {}
+
+
+def _compile_profile(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy profile keyword arguments, turning include/exclude sets into plain sets, which pydantic-core
+    matches fastest
+    """
+    def compile_fields(fields: Any) -> Any:
+        if isinstance(fields, (set, frozenset)):
+            return set(fields)
+        if isinstance(fields, dict):
+            return {key: compile_fields(value) for key, value in fields.items()}
+        return fields
+
+    compiled = {
+        key: compile_fields(value) if key in ('include', 'exclude') else value for key, value in kwargs.items()
+    }
+    compiled.setdefault('warnings', True)
+    return compiled
+
+
+@functools.lru_cache(maxsize=None)
+def _required_placeholders(cls: Type[BaseModel]) -> Dict[str, None]:
+    # required fields start out as None, matching objects created with no arguments
+    return {field: None for field, info in cls.model_fields.items() if info.is_required()}
+
+
+@functools.lru_cache(maxsize=None)
+def _field_defaults(cls: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    # (field, default) pairs, where required fields have no default and are never excluded from a dump
+    return tuple((field, info.default) for field, info in cls.model_fields.items())
+
+
 class NoValidator:
     def validate_python(self, _, self_instance: BaseModel):
         object.__setattr__(self_instance, '__pydantic_fields_set__', set())
@@ -61,7 +388,10 @@ class NoValidator:
 
 
 class Schema(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    # build validators and serializers on first use rather than at import, see _ensure_built()
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
+
+    serialization_profiles: ClassVar[Dict[str, Dict[str, Any]]] = SERIALIZATION_PROFILES
 
     def __init__(self, *args, **kwargs):
         if args or kwargs:
@@ -77,53 +407,243 @@ class Schema(BaseModel):
             raise KeyError
 
     @classmethod
-    def get_schema(cls):
+    def get_schema(cls) -> Dict[str, Any]:
         """
-        Get the path to the backing schema this Metadata object users
-        :return: Tuple[string, string] where first string is the path,
-        and the second is the schema name
+        Get the JSON schema for this model
+
+        The schema is generated once per class, and every call returns a new copy of it. Set the
+        ``POLYSWARMARTIFACT_SCHEMA_CACHE`` environment variable to a directory to also cache it on disk,
+        keyed by package and pydantic version.
+        """
+        return from_json(cls._cached_json_schema())
+
+    @classmethod
+    def get_schema_bytes(cls) -> bytes:
+        """
+        Get the JSON schema for this model, encoded as JSON
+        """
+        return cls._cached_json_schema()
+
+    @classmethod
+    def _ensure_built(cls):
+        """
+        Build the validator and serializer of this model now, if still deferred
+
+        Models defer building them until first used, which makes importing them cheap. Until then
+        their core schema, validator and serializer are placeholders, which must not be cached.
+        """
+        if not cls.__pydantic_complete__:
+            cls.model_rebuild()
+
+    @classmethod
+    def _cached_json_schema(cls) -> bytes:
+        cls._ensure_built()
+        core_schema = cls.__pydantic_core_schema__
+        cached = _schema_cache.get(cls)
+        # model_rebuild() replaces the core schema, which invalidates the cached JSON schema
+        if cached is None or cached[0] is not core_schema:
+            cached = (core_schema, _load_json_schema(cls))
+            _schema_cache[cls] = cached
+        return cached[1]
+
+    @classmethod
+    def build(cls, **data: Any) -> 'Schema':
+        """
+        Construct without any validation, for trusted data produced in-process
+
+        Nested objects must be passed as models, not dicts. Call :meth:`check` once the object
+        is complete, or skip validation entirely with ``json(validate=False)``. Root models, such as
+        assertions and bounties, take their items as ``root`` and start out empty.
+        """
+        if getattr(cls, '__pydantic_root_model__', False):
+            # RootModel.model_construct() requires root, even when it has a default
+            if 'root' not in data:
+                data['root'] = cls.model_fields['root'].get_default(call_default_factory=True)
+            return cls.model_construct(data.pop('root'), **data)
+        return cls.model_construct(**{**_required_placeholders(cls), **data})
+
+    def check(self) -> 'Schema':
+        """
+        Validate the current state of this object
+
+        Named so as not to shadow pydantic's deprecated ``validate()`` class method
+
+        :raises ValidationError: if the object is invalid
+        :return: self
         """
-        return cls.model_json_schema()
+        self.dict(context={'keep_raw_json': True})
+        return self
 
     @contextmanager
     def disable_validations(self):
-        validator = self.__pydantic_validator__
         try:
+            # shadow the class validator on this instance only
             object.__setattr__(self, '__pydantic_validator__', NoValidator())
             yield
         finally:
-            object.__setattr__(self, '__pydantic_validator__', validator)
+            # drop the override rather than storing a validator on the instance, which copies and pickles
+            # would carry along
+            self.__dict__.pop('__pydantic_validator__', None)
 
     def __str__(self):
         return self.json()
 
     def __eq__(self, other):
         if isinstance(other, dict):
-            return self.dict(exclude_defaults=True) == other
+            return self._equals_dict(other)
         else:
             return super().__eq__(other)
 
-    def dict(self, *args, by_alias=True, **kwargs):
+    def _equals_dict(self, other: Dict[str, Any]) -> bool:
+        """
+        Compare against a dict as ``self.model_dump(exclude_defaults=True) == other`` would, field by field
+        """
+        if getattr(type(self), '__pydantic_root_model__', False):
+            return self.model_dump(exclude_defaults=True) == other
+
+        matched = 0
+        values = self.__dict__
+        for field, default in _field_defaults(type(self)):
+            value = values.get(field, default)
+            if default is not PydanticUndefined and value == default:
+                if field in other:
+                    return False
+            elif field not in other or value != other[field]:
+                return False
+            else:
+                matched += 1
+
+        for key, value in (self.__pydantic_extra__ or {}).items():
+            if key not in other or value != other[key]:
+                return False
+            matched += 1
+        return matched == len(other)
+
+    def fingerprint(self) -> str:
+        """
+        Stable content hash of this object, computed from its canonical JSON form
+
+        Equal objects have equal fingerprints, so it can key caches and dedup sets. Objects are
+        mutable, so the fingerprint only holds until the object is next modified.
+        """
+        canonical = json.dumps(
+            self.model_dump(mode='json', by_alias=True, exclude_defaults=True),
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def dict(self, *args, by_alias=True, validate=True, **kwargs):
         model_dict = super().model_dump(*args, **kwargs)
-        super().model_validate(model_dict)
+        if validate:
+            super().model_validate(model_dict)
         return model_dict
 
-    def json(self, *args, by_alias=True, **kwargs):
+    def json(self, *args, by_alias=True, validate=True, cache=None, **kwargs):
+        """
+        Serialize to a JSON string
+
+        :param validate: re-validate the dumped model before serializing. Pass ``False`` for trusted
+            objects to serialize in a single pass
+        :param cache: ValidationCache this object came from, to serialize it only once. Only used
+            with the default options
+        """
+        cacheable = cache is not None and not args and not kwargs and by_alias
+        if cacheable:
+            output = cache.get_json(self)
+            if output is not None:
+                return output
         kwargs.setdefault('exclude_defaults', True)
-        # performing validation implicitly
-        self.dict(*args, by_alias=by_alias, **kwargs)
+        if validate:
+            # performing validation implicitly, without parsing RawJSON values
+            self.dict(*args, by_alias=by_alias, context={'keep_raw_json': True}, **kwargs)
         # use the custom json parser here
-        return self.model_dump_json(*args, by_alias=by_alias, **kwargs)
+        context: Dict[str, Any] = {'raw_json': []}
+        output = _splice_raw_json(self.model_dump_json(*args, by_alias=by_alias, context=context, **kwargs), context)
+        if cacheable:
+            cache.put_json(self, output)
+        return output
 
     @classmethod
-    def model_validate(cls: Type['BaseModel'], value: Any, **kwargs) -> 'Union[Schema, bool]':
+    def _compiled_profile(cls, profile: str) -> Tuple[Any, Dict[str, Any]]:
+        cls._ensure_built()
+        serializer = cls.__pydantic_serializer__
+        cached = _profile_cache.get((cls, profile))
+        # model_rebuild() replaces the serializer, so profiles are recompiled against the new one
+        if cached is None or cached[0] is not serializer:
+            try:
+                kwargs = cls.serialization_profiles[profile]
+            except KeyError:
+                raise ValueError('Unknown serialization profile {!r} for {}'.format(profile, cls.__name__)) from None
+            cached = (serializer, _compile_profile(kwargs))
+            _profile_cache[(cls, profile)] = cached
+        return cached
+
+    def dump(self, profile: str = 'wire', mode: str = 'python', validate: bool = True) -> Any:
+        """
+        Serialize with a named profile from :attr:`serialization_profiles`
+
+        Each profile is compiled once per class, so this skips resolving serialization options on
+        every call. Built-in profiles are ``wire`` (by alias, without defaults) and ``storage`` (every
+        field); verdicts and assertions also have ``index`` (malware_family, domains and ip_addresses).
+
+        :param mode: ``python`` or ``json``, see ``model_dump()``
+        :param validate: validate the object first, see :meth:`check`
+        :raises ValueError: if the profile is unknown for this model
+        """
+        serializer, kwargs = self._compiled_profile(profile)
+        if validate:
+            self.dict(context={'keep_raw_json': True})
+        return serializer.to_python(self, mode=mode, **kwargs)
+
+    def dump_json(self, profile: str = 'wire', validate: bool = True) -> bytes:
+        """
+        Serialize to JSON bytes with a named profile, see :meth:`dump`
+        """
+        serializer, kwargs = self._compiled_profile(profile)
+        if validate:
+            self.dict(context={'keep_raw_json': True})
+        context: Dict[str, Any] = {'raw_json': []}
+        return _splice_raw_json(serializer.to_json(self, context=context, **kwargs), context)
+
+    @classmethod
+    def model_validate(cls: Type['BaseModel'], value: Any, cache=None, **kwargs) -> 'Union[Schema, bool]':
+        """
+        Validate `value` as this model, returning False (and logging why) if it is invalid
+
+        :param cache: ValidationCache to look the payload up in first. Not used with other options
+        """
         try:
+            if cache is not None and not kwargs:
+                return cache.validate(cls, value, json=False)
             return BaseModel.model_validate.__func__(cls, value, **kwargs)
         except ValidationError as e:
             logger.error(e)
             return False
         return False
 
+    @classmethod
+    def validate_many(cls, items: Union[bytes, str, Iterable[Any]]) -> BatchResult:
+        """
+        Validate a batch of payloads as this model without logging each failure
+
+        See :func:`validate_many`
+        """
+        return validate_many(cls, items)
+
+    @classmethod
+    async def avalidate_json(cls, data: Union[bytes, bytearray, str], **kwargs) -> 'Schema':
+        """
+        Validate a JSON payload as this model, off the event loop when it is large
+
+        See :func:`polyswarmartifact.schema.aio.avalidate_json`
+
+        :raises ValidationError: if the payload is invalid
+        """
+        from .aio import avalidate_json
+        return await avalidate_json(cls, data, **kwargs)
+
     @classmethod
     def _model_validate_old(cls: Type['BaseModel'], value: Any, **kwargs) -> 'Union[Schema, bool]':
         """
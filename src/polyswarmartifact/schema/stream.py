@@ -0,0 +1,65 @@
+"""
+Streaming newline-delimited JSON (NDJSON) reader and writer for schema objects
+"""
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Union
+
+from pydantic import ValidationError
+
+from ..exceptions import DecodeError
+from .schema import Schema, _compact_errors, get_adapter
+from .verdict import Verdict
+
+
+class InvalidRecord(NamedTuple):
+    """
+    A record that failed to decode, yielded in place of the model when skipping invalid records
+    """
+    line: int
+    data: bytes
+    errors: List[Dict[str, Any]]
+
+
+def read_ndjson(
+    fp: BinaryIO,
+    type_: Any = Verdict,
+    skip_invalid: bool = False,
+) -> Iterator[Union[Any, InvalidRecord]]:
+    """
+    Lazily decode one record per line from a binary file object
+
+    Only one line is held in memory at a time, and each is validated straight from bytes.
+
+    :param fp: binary file object to read from
+    :param type_: model class (or union of them) each line should validate as
+    :param skip_invalid: yield an InvalidRecord for lines that fail to decode instead of raising
+    :raises DecodeError: if a line fails to decode and `skip_invalid` is not set
+    """
+    adapter = get_adapter(type_)
+    for number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield adapter.validate_json(line)
+        except ValidationError as e:
+            if not skip_invalid:
+                raise DecodeError('Invalid record on line {}'.format(number)) from e
+            yield InvalidRecord(number, line, _compact_errors(e.errors(include_url=False)))
+
+
+def write_ndjson(fp: BinaryIO, records: Iterable[Schema], validate: bool = True) -> int:
+    """
+    Encode records to a binary file object, one per line
+
+    :param fp: binary file object to write to
+    :param records: schema objects to write, consumed lazily
+    :param validate: validate each record before writing it, see :meth:`Schema.json`
+    :return: number of records written
+    """
+    count = 0
+    for record in records:
+        fp.write(record.json(validate=validate).encode('utf-8'))
+        fp.write(b'\n')
+        count += 1
+    return count
@@ -1,8 +1,12 @@
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import Field, IPvAnyAddress, StrictStr, ConfigDict
+from pydantic import AfterValidator, Field, IPvAnyAddress, StrictStr, ConfigDict
 
-from .schema import Domain, Schema, VersionStr, chainable
+from .intern import InternedStr, intern_string
+from .schema import SERIALIZATION_PROFILES, Domain, Schema, VersionStr, chainable, validate_raw_json
+
+# fields kept by the 'index' serialization profile
+INDEX_FIELDS = frozenset(['malware_family', 'domains', 'ip_addresses'])
 
 
 class Scanner(Schema):
@@ -11,14 +15,21 @@ class Scanner(Schema):
         default = None,
     )
     polyswarmclient_version: Optional[VersionStr] = Field(description="version of polyswarmclient", default=None)
-    vendor_version: Optional[str] = Field(description="version of the engine that generated the assertion", default=None)
-    signatures_version: Optional[str] = Field(description="version of the engine's antimalware signatures", default=None)
+    vendor_version: Optional[InternedStr] = Field(
+        description="version of the engine that generated the assertion",
+        default=None,
+    )
+    signatures_version: Optional[InternedStr] = Field(
+        description="version of the engine's antimalware signatures",
+        default=None,
+    )
     environment: Optional[Dict[str, Any]] = Field(description="analysis environment metadata", default=None)
 
 
 class StixSignature(Schema):
-    stix_schema: str = Field(alias='schema')
-    signature: Any
+    stix_schema: InternedStr = Field(alias='schema')
+    # may hold a RawJSON, which compares equal to its parsed value and only parses it once read
+    signature: Annotated[Any, AfterValidator(validate_raw_json)]
 
     @property
     def schema(self):
@@ -32,7 +43,9 @@ class StixSignature(Schema):
 class ScanMetadata(Schema):
     model_config = ConfigDict(populate_by_name=True, extra='allow')
 
-    malware_family: StrictStr = Field(
+    serialization_profiles = {**SERIALIZATION_PROFILES, 'index': {'by_alias': True, 'include': INDEX_FIELDS}}
+
+    malware_family: Annotated[StrictStr, AfterValidator(intern_string)] = Field(
         default=...,
         description='name of the malware family specified by this microengine',
     )
@@ -0,0 +1,117 @@
+"""
+Lightweight read-only views over verdict payloads
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic_core import from_json
+
+from .schema import get_adapter
+from .verdict import Verdict
+
+_FIELDS = ('malware_family', 'domains', 'ip_addresses', 'stix', 'scanner', 'heuristic')
+_FIELD_SET = frozenset(_FIELDS)
+
+
+class VerdictView:
+    """
+    Read-only view of a verdict payload, for reading many verdicts without building models
+
+    Attributes match :class:`ScanMetadata`, but nothing is validated: `domains`, `ip_addresses` and
+    `stix` are tuples of the raw values, and `scanner` is the raw dict. Use :meth:`to_verdict` to get a
+    validated Verdict.
+    """
+    __slots__ = _FIELDS + ('_extra',)
+
+    malware_family: Optional[str]
+    domains: Tuple[str, ...]
+    ip_addresses: Tuple[str, ...]
+    stix: Tuple[Dict[str, Any], ...]
+    scanner: Optional[Dict[str, Any]]
+    heuristic: Optional[bool]
+    _extra: Optional[Dict[str, Any]]
+
+    def __init__(
+        self,
+        malware_family: Optional[str] = None,
+        domains: Iterable[str] = (),
+        ip_addresses: Iterable[str] = (),
+        stix: Iterable[Dict[str, Any]] = (),
+        scanner: Optional[Dict[str, Any]] = None,
+        heuristic: Optional[bool] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        setattr_ = object.__setattr__
+        setattr_(self, 'malware_family', malware_family)
+        setattr_(self, 'domains', tuple(domains or ()))
+        setattr_(self, 'ip_addresses', tuple(ip_addresses or ()))
+        setattr_(self, 'stix', tuple(stix or ()))
+        setattr_(self, 'scanner', scanner)
+        setattr_(self, 'heuristic', heuristic)
+        setattr_(self, '_extra', extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is read-only'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is read-only'.format(type(self).__name__))
+
+    def __repr__(self):
+        return 'VerdictView({})'.format(', '.join('{}={!r}'.format(k, v) for k, v in self.to_dict().items()))
+
+    def __eq__(self, other):
+        if isinstance(other, VerdictView):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def extra(self) -> List[Tuple[str, Any]]:
+        return list(self._extra.items()) if self._extra else []
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VerdictView':
+        extra = None
+        if not data.keys() <= _FIELD_SET:
+            extra = {key: value for key, value in data.items() if key not in _FIELD_SET}
+        return cls(
+            data.get('malware_family'),
+            data.get('domains'),
+            data.get('ip_addresses'),
+            data.get('stix'),
+            data.get('scanner'),
+            data.get('heuristic'),
+            extra,
+        )
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, bytearray, str]) -> 'VerdictView':
+        return cls.from_dict(from_json(data))
+
+    @classmethod
+    def many_from_json(cls, data: Union[bytes, bytearray, str]) -> Iterator['VerdictView']:
+        """
+        Views over each verdict of a JSON encoded Assertion
+        """
+        return map(cls.from_dict, from_json(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The payload this view was built from, leaving out empty fields
+        """
+        data: Dict[str, Any] = {}
+        for field in _FIELDS:
+            value = getattr(self, field)
+            if value is not None and value != ():
+                data[field] = list(value) if isinstance(value, tuple) else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def to_verdict(self) -> Verdict:
+        """
+        Validate this view into a full Verdict
+
+        :raises ValidationError: if the payload is not a valid verdict
+        """
+        return get_adapter(Verdict).validate_python(self.to_dict())
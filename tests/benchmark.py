@@ -0,0 +1,200 @@
+"""
+Benchmarks for the schema package's hot paths
+
+Run from the repository root:
+
+    python -m tests.benchmark --output results.json
+    python -m tests.benchmark --compare results.json --threshold 1.5
+
+Comparison mode exits non-zero when any benchmark is slower than its baseline by more than the
+threshold factor.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import pydantic
+from pydantic import IPvAnyAddress, TypeAdapter
+
+from polyswarmartifact import ArtifactType, __version__
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Bounty
+from polyswarmartifact.schema.columnar import VerdictBatch
+from polyswarmartifact.schema.schema import Domain
+from polyswarmartifact.schema.verdict import Scanner, StixSignature, Verdict
+from polyswarmartifact.schema.view import VerdictView
+
+ITERATIONS = 1000
+
+HEX_SCHEMA = 'oasis-open/cti-stix2-json-schemas/master/schemas/common/hex.json'
+SHA256 = '74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a'
+SHA1 = 'f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8'
+MD5 = '772ac1a55fab1122f3b369ee9cd31549'
+
+
+def per_call(fn: Callable[[], Any], number: int = ITERATIONS) -> float:
+    """
+    Best of three runs of `fn`, in microseconds per call
+    """
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def make_verdict() -> Verdict:
+    return Verdict().set_malware_family('Eicar')\
+        .add_domains(['polyswarm.io', 'polyswarm.network'])\
+        .add_ip_addresses(['192.168.0.1', '8.8.8.8'])\
+        .add_stix_signature(HEX_SCHEMA, 'a0')\
+        .set_scanner(operating_system='windows', architecture='x86', version='1.0.0',
+                     polyswarmclient_version='2.0.2', signatures_version='2019', vendor_version='1.0.0')
+
+
+def build_verdict() -> Verdict:
+    return Verdict.build(
+        malware_family='Eicar',
+        domains=['polyswarm.io', 'polyswarm.network'],
+        ip_addresses=['192.168.0.1', '8.8.8.8'],
+        stix=[StixSignature.build(schema=HEX_SCHEMA, signature='a0')],
+        scanner=Scanner.build(version='1.0.0', polyswarmclient_version='2.0.2', signatures_version='2019',
+                              vendor_version='1.0.0',
+                              environment={'architecture': 'x86', 'operating_system': 'windows'}),
+    )
+
+
+def make_bounty(size: int = 16) -> Bounty:
+    bounty = Bounty()
+    for i in range(0, size):
+        bounty.add_file_artifact(mimetype='text/plain', filename='file', filesize=i + 1,
+                                 sha256=SHA256, sha1=SHA1, md5=MD5)
+    return bounty
+
+
+def benchmarks() -> Dict[str, Callable[[], Any]]:
+    """
+    Map each benchmark name to the zero argument callable it times
+    """
+    verdict = make_verdict()
+    verdict_dict = json.loads(verdict.json())
+    verdict_json = verdict.json().encode('utf-8')
+    verdict_eq_dict = verdict.model_dump(exclude_defaults=True)
+    verdict_copy = Verdict.model_validate(verdict_dict)
+    assertion_dicts = [verdict_dict] * 16
+    assertion_json = json.dumps(assertion_dicts).encode('utf-8')
+    assertion = Assertion.model_validate(assertion_dicts)
+    bounty = make_bounty()
+    bounty_dicts = json.loads(bounty.json())
+    bounty_json = bounty.json().encode('utf-8')
+    domain = TypeAdapter(Domain)
+    ip_address = TypeAdapter(IPvAnyAddress)
+    url = b'https://polyswarm.io/some/path?query=value'
+    urls = [url] * 256
+    url_strings = ['polyswarm.io/{}'.format(i) for i in range(0, 16)]
+    file = b'\x00' * 1024
+
+    return {
+        'verdict.construct.kwargs': lambda: Verdict(**verdict_dict),
+        'verdict.construct.chained': make_verdict,
+        'verdict.construct.build': build_verdict,
+        'assertion.construct.kwargs': lambda: Assertion(assertion_dicts),
+        'assertion.construct.chained': lambda: Assertion().add_artifacts([make_verdict() for _ in range(0, 16)]),
+        'bounty.construct.kwargs': lambda: Bounty(bounty_dicts),
+        'bounty.construct.chained': make_bounty,
+        'bounty.construct.urls': lambda: Bounty().add_url_artifacts(url_strings, protocol='https://'),
+        'verdict.validate.dict': lambda: Verdict.model_validate(verdict_dict),
+        'verdict.validate.json': lambda: Verdict.model_validate_json(verdict_json),
+        'verdict.view.json': lambda: VerdictView.from_json(verdict_json),
+        'assertion.validate.dict': lambda: Assertion.model_validate(assertion_dicts),
+        'assertion.validate.json': lambda: Assertion.model_validate_json(assertion_json),
+        'assertion.columnar.dict': lambda: VerdictBatch.from_verdicts(assertion_dicts),
+        'bounty.validate.dict': lambda: Bounty.model_validate(bounty_dicts),
+        'bounty.validate.json': lambda: Bounty.model_validate_json(bounty_json),
+        'verdict.json': verdict.json,
+        'verdict.json.trusted': lambda: verdict.json(validate=False),
+        'verdict.dict': verdict.dict,
+        'verdict.dump.wire': lambda: verdict.dump(validate=False),
+        'verdict.dump.index': lambda: verdict.dump('index', validate=False),
+        'verdict.dump_json.wire': lambda: verdict.dump_json(validate=False),
+        'verdict.eq.dict': lambda: verdict == verdict_eq_dict,
+        'verdict.eq.verdict': lambda: verdict == verdict_copy,
+        'assertion.json': assertion.json,
+        'bounty.json': bounty.json,
+        'domain.validate': lambda: domain.validate_python('sub.polyswarm.network'),
+        'ip_address.validate': lambda: ip_address.validate_python('192.168.0.1'),
+        'artifact_type.decode_content.url': lambda: ArtifactType.URL.decode_content(url),
+        'artifact_type.decode_content.file': lambda: ArtifactType.FILE.decode_content(file),
+        'artifact_type.decode_many.url': lambda: ArtifactType.URL.decode_many(urls),
+    }
+
+
+def run(names: Optional[List[str]] = None, number: int = ITERATIONS) -> Dict[str, Any]:
+    """
+    Run the benchmarks (all of them, or only `names`)
+
+    :return: machine-readable results, with environment metadata and microseconds per call
+    """
+    cases = benchmarks()
+    results = {}
+    for name, fn in cases.items():
+        if names and name not in names:
+            continue
+        results[name] = {'usec_per_call': per_call(fn, number), 'number': number}
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pydantic': pydantic.VERSION,
+            'polyswarm_artifact': __version__,
+        },
+        'results': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare results against a baseline run
+
+    :return: every benchmark present in both runs, with its slowdown ratio and whether it regressed
+    """
+    comparison = {}
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            continue
+        ratio = result['usec_per_call'] / baseline['results'][name]['usec_per_call']
+        comparison[name] = {'ratio': ratio, 'regressed': ratio > threshold}
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', help='benchmarks to run, defaults to all of them')
+    parser.add_argument('--number', type=int, default=ITERATIONS, help='calls per timing run')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.5, help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.names, args.number)
+    comparison = {}
+    if args.compare:
+        with open(args.compare) as f:
+            comparison = compare(results, json.load(f), args.threshold)
+        results['comparison'] = comparison
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    for name, result in results['results'].items():
+        line = '{:<40} {:>10.2f}us'.format(name, result['usec_per_call'])
+        if name in comparison:
+            flag = '  REGRESSION' if comparison[name]['regressed'] else ''
+            line += '  {:>6.2f}x{}'.format(comparison[name]['ratio'], flag)
+        print(line)
+
+    return 1 if any(entry['regressed'] for entry in comparison.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
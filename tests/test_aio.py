@@ -0,0 +1,78 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+from polyswarmartifact.schema import aio
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Bounty
+
+ASSERTION = json.dumps([{"malware_family": "Eicar", "domains": ["polyswarm.io"]}] * 4).encode('utf-8')
+BOUNTY = json.dumps([
+    {"mimetype": "text/plain", "filename": "file"},
+    {"protocol": "https", "uri": "https://polyswarm.io"},
+]).encode('utf-8')
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.calls = 0
+
+    def submit(self, *args, **kwargs):
+        self.calls += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_assertion_avalidate_json_inline():
+    # arrange
+    executor = RecordingExecutor()
+    # act
+    assertion = asyncio.run(Assertion.avalidate_json(ASSERTION, executor=executor))
+    # assert
+    assert isinstance(assertion, Assertion)
+    assert [verdict.malware_family for verdict in assertion] == ["Eicar"] * 4
+    assert executor.calls == 0
+
+
+def test_bounty_avalidate_json_offloaded():
+    # arrange
+    executor = RecordingExecutor()
+    # act
+    bounty = asyncio.run(Bounty.avalidate_json(BOUNTY, executor=executor, threshold=0))
+    # assert
+    assert len(bounty.root) == 2
+    assert executor.calls == 1
+
+
+def test_avalidate_json_process_pool():
+    # arrange
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        # act
+        assertion = asyncio.run(Assertion.avalidate_json(ASSERTION, executor=executor, threshold=0))
+    # assert
+    assert assertion.json() == Assertion.model_validate_json(ASSERTION).json()
+
+
+def test_configure():
+    # arrange
+    executor = RecordingExecutor()
+    aio.configure(executor, threshold=1)
+    # act
+    try:
+        asyncio.run(Assertion.avalidate_json(ASSERTION))
+    finally:
+        aio.configure()
+    # assert
+    assert executor.calls == 1
+
+
+@pytest.mark.parametrize('threshold', [0, aio.DEFAULT_THRESHOLD])
+def test_avalidate_json_invalid(threshold):
+    # arrange
+    data = b'[{"malware_family": 1}]'
+    # act
+    # assert
+    with pytest.raises(ValidationError):
+        asyncio.run(Assertion.avalidate_json(data, threshold=threshold))
@@ -0,0 +1,109 @@
+import io
+
+import pytest
+from polyswarmartifact.exceptions import DecodeError
+from polyswarmartifact.schema.archive import Archive, build_index
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Bounty
+from polyswarmartifact.schema.stream import write_ndjson
+from polyswarmartifact.schema.verdict import Verdict
+
+
+def sha256(i):
+    return '{:064x}'.format(i)
+
+
+def write_bounties(path, count=20):
+    bounties = [
+        Bounty().add_file_artifact(mimetype='text/plain', sha256=sha256(i))
+        .add_file_artifact(mimetype='text/plain', sha256=sha256(i + 1))
+        for i in range(0, count)
+    ]
+    with open(path, 'wb') as f:
+        write_ndjson(f, bounties)
+    return bounties
+
+
+def test_random_access(tmp_path):
+    # arrange
+    path = str(tmp_path / 'bounties.ndjson')
+    bounties = write_bounties(path)
+    # act
+    with Archive(path) as archive:
+        count = len(archive)
+        record = archive[7]
+        last = archive[-1]
+        with archive.raw(3) as raw:
+            encoded = raw.tobytes()
+    # assert
+    assert count == 20
+    assert record.json() == bounties[7].json()
+    assert last.json() == bounties[-1].json()
+    assert encoded == bounties[3].json().encode('utf-8')
+
+
+def test_find_sha256(tmp_path):
+    # arrange
+    path = str(tmp_path / 'bounties.ndjson')
+    bounties = write_bounties(path)
+    # act
+    with Archive(path) as archive:
+        numbers = archive.records_with_sha256(sha256(5))
+        found = archive.find_sha256(bytes.fromhex(sha256(20)))
+        missing = archive.records_with_sha256(sha256(1000))
+    # assert
+    assert numbers == [4, 5]
+    assert [bounty.json() for bounty in found] == [bounties[19].json()]
+    assert missing == []
+
+
+def test_assertions(tmp_path):
+    # arrange
+    path = tmp_path / 'assertions.ndjson'
+    fp = io.BytesIO()
+    assertions = [Assertion().add_artifact(Verdict().set_malware_family(family)) for family in ('Eicar', 'Trojan')]
+    write_ndjson(fp, assertions)
+    path.write_bytes(b'\n' + fp.getvalue().replace(b'\n', b'\r\n\n'))
+    # act
+    with Archive(str(path), type_=Assertion) as archive:
+        families = [assertion[0].malware_family for assertion in archive]
+    # assert
+    assert families == ['Eicar', 'Trojan']
+
+
+def test_empty_archive(tmp_path):
+    # arrange
+    path = tmp_path / 'empty.ndjson'
+    path.write_bytes(b'')
+    # act
+    with Archive(str(path)) as archive:
+        # assert
+        assert len(archive) == 0
+        assert archive.records_with_sha256(sha256(1)) == []
+        with pytest.raises(IndexError):
+            archive.raw(0)
+
+
+def test_stale_index(tmp_path):
+    # arrange
+    path = str(tmp_path / 'bounties.ndjson')
+    write_bounties(path, count=2)
+    build_index(path)
+    write_bounties(path, count=3)
+    # act
+    # assert
+    with pytest.raises(DecodeError):
+        Archive(path)
+    assert build_index(path) == 3
+    with Archive(path) as archive:
+        assert len(archive) == 3
+
+
+def test_invalid_record(tmp_path):
+    # arrange
+    path = tmp_path / 'bounties.ndjson'
+    path.write_bytes(b'[]\nnot json\n')
+    # act
+    # assert
+    with pytest.raises(DecodeError):
+        build_index(str(path))
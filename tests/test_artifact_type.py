@@ -1,3 +1,7 @@
+import mmap
+import subprocess
+import sys
+
 import pytest
 from polyswarmartifact import ArtifactType
 from polyswarmartifact.exceptions import DecodeError
@@ -129,3 +133,57 @@ def test_url_decode_invalid_raises():
     # assert
     with pytest.raises(DecodeError):
         ArtifactType.URL.decode_content('asdf'.encode('utf-16'))
+
+
+def test_url_decode_memoryview():
+    # arrange
+    # act
+    # assert
+    assert ArtifactType.URL.decode_content(memoryview(b'https://polyswarm.io')) == 'https://polyswarm.io'
+
+
+def test_url_decode_many_ascii():
+    # arrange
+    content = mmap.mmap(-1, 8)
+    content.write(b'http://c')
+    # act
+    results, errors = ArtifactType.URL.decode_many(
+        [b'https://a', bytearray(b'http://b'), memoryview(b'xhttp://d')[1:], content, None, b'']
+    )
+    # assert
+    assert results == ['https://a', 'http://b', 'http://d', 'http://c', None, '']
+    assert errors == {}
+
+
+def test_url_decode_many_utf8_fallback():
+    # arrange
+    contents = [b'https://a', 'https://é'.encode('utf-8'), 'asdf'.encode('utf-16'), 'https://b']
+    # act
+    results, errors = ArtifactType.URL.decode_many(contents)
+    # assert
+    assert results == ['https://a', 'https://é', None, None]
+    assert list(errors) == [2, 3]
+    assert all(isinstance(error, DecodeError) for error in errors.values())
+
+
+def test_file_decode_many_memoryview():
+    # arrange
+    content = bytearray(b'\x00\x01')
+    # act
+    results, errors = ArtifactType.FILE.decode_many([content, None])
+    content[0] = 0xff
+    # assert
+    assert isinstance(results[0], memoryview)
+    assert results[0].tobytes() == b'\xff\x01'
+    assert results[1] is None
+    assert errors == {}
+
+
+def test_decode_many_does_not_import_pydantic():
+    # arrange
+    code = 'import sys; from polyswarmartifact import ArtifactType; ' \
+           'ArtifactType.URL.decode_many([b"a"]); print("pydantic" in sys.modules)'
+    # act
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+    # assert
+    assert output.strip() == b'False'
@@ -103,3 +103,71 @@ def test_builder_256_scanners_is_valid():
         assertion.add_artifact(artifact)
     # assert
     assert Assertion.model_validate(json.loads(assertion.json()))
+
+
+def test_validate_many():
+    # arrange
+    blobs = [
+        [{"malware_family": "Eicar"}],
+        [{"malware_familty": None}],
+        b'[{"malware_family": "Eicar", "domains": ["polyswarm.io"]}]',
+        [],
+    ]
+    # act
+    results, errors = Assertion.validate_many(blobs)
+    # assert
+    assert results[0] == Assertion.model_validate(blobs[0])
+    assert results[1] is None
+    assert results[2].artifacts[0].domains == ['polyswarm.io']
+    assert results[3] is None
+    assert sorted(errors) == [1, 3]
+    assert errors[1][0]['loc'] == (0, 'malware_family')
+
+
+def test_validate_many_json_array():
+    # arrange
+    blob = b'[[{"malware_family": "Eicar"}], [{"malware_family": "Trojan"}]]'
+    # act
+    results, errors = Assertion.validate_many(blob)
+    # assert
+    assert not errors
+    assert [result[0].malware_family for result in results] == ["Eicar", "Trojan"]
+
+
+def test_validate_many_verdicts():
+    # arrange
+    blobs = [{"malware_family": "Eicar"}, b'not json', {"malware_family": 1}]
+    # act
+    results, errors = Verdict.validate_many(blobs)
+    # assert
+    assert results[0].malware_family == "Eicar"
+    assert results[1] is None and results[2] is None
+    assert errors[1][0]['type'] == 'json_invalid'
+    assert errors[2][0]['loc'] == ('malware_family',)
+
+
+def test_dump_index_profile():
+    # arrange
+    assertion = Assertion().add_artifacts([
+        Verdict().set_malware_family("Eicar").add_domain('polyswarm.io').set_scanner(version='1.0.0'),
+        Verdict().set_malware_family("Trojan"),
+    ])
+    # act
+    index = assertion.dump('index', mode='json')
+    # assert
+    assert index == [
+        {"malware_family": "Eicar", "domains": ['polyswarm.io'], "ip_addresses": []},
+        {"malware_family": "Trojan", "domains": [], "ip_addresses": []},
+    ]
+    assert assertion.dump_json() == assertion.json().encode('utf-8')
+
+
+def test_build():
+    # arrange
+    # act
+    assertion = Assertion.build().add_artifact(Verdict.build(malware_family="Eicar"))
+    # assert
+    assert assertion.check() is assertion
+    assert assertion.json() == Assertion().add_artifact(Verdict().set_malware_family("Eicar")).json()
+    assert Assertion.build().artifacts == []
+    assert Assertion.build().artifacts is not Assertion.build().artifacts
@@ -0,0 +1,473 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from pydantic import TypeAdapter, ValidationError, constr
+from polyswarmartifact import ArtifactType
+from polyswarmartifact.content import scan
+from polyswarmartifact.schema import binary
+from polyswarmartifact.schema.archive import Archive, build_index
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Bounty, CompactFileArtifact, FileArtifact
+from polyswarmartifact.schema.cache import ValidationCache
+from polyswarmartifact.schema.columnar import VerdictBatch
+from polyswarmartifact.schema.digest import normalize_digests
+from polyswarmartifact.schema.parallel import validate_ndjson
+from polyswarmartifact.schema.stream import read_ndjson, write_ndjson
+from polyswarmartifact.schema.schema import DOMAIN_PATTERN, Domain, RawJSON
+from polyswarmartifact.schema.verdict import Verdict
+from polyswarmartifact.schema.view import VerdictView
+from tests.benchmark import SHA256, build_verdict, compare, main, make_bounty, make_verdict, per_call, run
+
+logger = logging.getLogger(__name__)
+
+
+def test_verdict_json_single_pass():
+    # arrange
+    verdict = make_verdict()
+    # act
+    validated = per_call(verdict.json)
+    trusted = per_call(lambda: verdict.json(validate=False))
+    logger.info('Verdict.json(): %.2fus validated, %.2fus single pass', validated, trusted)
+    # assert
+    assert verdict.json(validate=False) == verdict.json()
+
+
+def test_assertion_json_single_pass():
+    # arrange
+    assertion = Assertion().add_artifacts([make_verdict() for _ in range(0, 16)])
+    # act
+    validated = per_call(assertion.json, number=100)
+    trusted = per_call(lambda: assertion.json(validate=False), number=100)
+    logger.info('Assertion.json() (16 verdicts): %.2fus validated, %.2fus single pass', validated, trusted)
+    # assert
+    assert json.loads(assertion.json(validate=False)) == json.loads(assertion.json())
+
+
+def test_verdict_build():
+    # arrange
+    # act
+    chained = per_call(make_verdict)
+    built = per_call(build_verdict)
+    validated = per_call(lambda: build_verdict().check())
+    logger.info('Verdict construction: %.2fus chained setters, %.2fus build(), %.2fus build().check()',
+                chained, built, validated)
+    # assert
+    assert build_verdict().json() == make_verdict().json()
+
+
+def test_verdict_equals_dict():
+    # arrange
+    verdict = make_verdict()
+    cached = verdict.model_dump(exclude_defaults=True)
+    # act
+    before = per_call(lambda: verdict.dict(exclude_defaults=True) == cached)
+    after = per_call(lambda: verdict == cached)
+    logger.info('Verdict == dict: %.2fus dump and validate, %.2fus field by field', before, after)
+    # assert
+    assert verdict == cached
+
+
+def test_verdict_binary_encoding():
+    # arrange
+    verdict = make_verdict()
+    encoded_json = verdict.json().encode('utf-8')
+    encoded = binary.encode(verdict)
+    # act
+    json_encode = per_call(lambda: verdict.json(validate=False))
+    binary_encode = per_call(lambda: binary.encode(verdict, validate=False))
+    json_decode = per_call(lambda: Verdict.model_validate_json(encoded_json))
+    binary_decode = per_call(lambda: binary.decode(encoded))
+    logger.info('Verdict size: %d bytes JSON, %d bytes binary', len(encoded_json), len(encoded))
+    logger.info('Verdict encode: %.2fus JSON, %.2fus binary', json_encode, binary_encode)
+    logger.info('Verdict decode: %.2fus JSON, %.2fus binary', json_decode, binary_decode)
+    # assert
+    assert len(encoded) < len(encoded_json)
+
+
+def test_verdict_json_raw_stix():
+    # arrange
+    objects = [{'id': 'indicator--{}'.format(i), 'pattern': 'a' * 64} for i in range(0, 500)]
+    bundle = {'type': 'bundle', 'objects': objects}
+    raw = json.dumps(bundle).encode('utf-8')
+    parsed = make_verdict().add_stix_signature('bundle.json', json.loads(raw))
+    # act
+    before = per_call(lambda: make_verdict().add_stix_signature('bundle.json', json.loads(raw)).json(), number=20)
+    after = per_call(lambda: make_verdict().add_stix_signature('bundle.json', RawJSON(raw)).json(), number=20)
+    logger.info('Forwarding a verdict with a 500 object STIX bundle: %.2fus parsed, %.2fus raw', before, after)
+    # assert
+    forwarded = make_verdict().add_stix_signature('bundle.json', RawJSON(raw))
+    assert json.loads(forwarded.json()) == json.loads(parsed.json())
+
+
+def test_bounty_bulk_digests():
+    # arrange
+    artifacts = json.loads(make_bounty(256).json())
+    digests = [SHA256] * 100000
+    # act
+    per_artifact = per_call(lambda: Bounty(artifacts), number=20)
+    bulk = per_call(lambda: Bounty.from_file_artifacts(artifacts), number=20)
+    normalize = per_call(lambda: normalize_digests(digests, 64), number=5) / len(digests)
+    logger.info('Bounty of 256 file artifacts: %.2fus validated per artifact, %.2fus bulk digests', per_artifact, bulk)
+    logger.info('normalize_digests: %.3fus per digest', normalize)
+    # assert
+    assert Bounty.from_file_artifacts(artifacts).json() == Bounty(artifacts).json()
+
+
+def allocated_per_item(factory, count=10000):
+    """
+    Bytes allocated per item when building `count` items with `factory`
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory(i) for i in range(0, count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(items) == count
+    return (after - before) / count
+
+
+def test_compact_file_artifact_memory():
+    # arrange
+    def digests(i):
+        return {
+            'sha256': '{:064x}'.format(i),
+            'sha1': '{:040x}'.format(i),
+            'md5': '{:032x}'.format(i),
+        }
+    # act
+    hex_digests = allocated_per_item(lambda i: FileArtifact(mimetype='text/plain', **digests(i)))
+    raw_digests = allocated_per_item(lambda i: CompactFileArtifact(mimetype='text/plain', **digests(i)))
+    logger.info('FileArtifact memory: %d bytes with hex digests, %d bytes compact', hex_digests, raw_digests)
+    # assert
+    assert raw_digests < hex_digests
+
+
+def test_verdict_view_memory():
+    # arrange
+    payload = make_verdict().json().encode('utf-8')
+    # act
+    models = allocated_per_item(lambda i: Verdict.model_validate_json(payload))
+    views = allocated_per_item(lambda i: VerdictView.from_json(payload))
+    logger.info('Verdict memory: %d bytes as a model, %d bytes as a view', models, views)
+    # assert
+    assert views < models
+
+
+def test_verdict_batch_build():
+    # arrange
+    verdict = json.loads(make_verdict().json())
+    assertions = [[verdict] * 16] * 16
+    # act
+    models = per_call(lambda: [Assertion.model_validate(assertion) for assertion in assertions], number=20)
+    columns = per_call(lambda: VerdictBatch.from_assertions(assertions), number=20)
+    logger.info('256 verdicts: %.2fus as Assertions, %.2fus as a VerdictBatch', models, columns)
+    # assert
+    assert VerdictBatch.from_assertions(assertions).malware_family == [verdict['malware_family']] * 256
+
+
+def event_loop_lag(validate, payload, concurrency=4):
+    """
+    Worst delay, in milliseconds, of a 1ms timer on the event loop while `validate` runs `concurrency` times
+    """
+    async def measure():
+        lags = []
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await asyncio.gather(*(validate(payload) for _ in range(0, concurrency)))
+        done.set()
+        await task
+        return max(lags) * 1e3
+
+    return asyncio.run(measure())
+
+
+def test_assertion_avalidate_json_event_loop_lag():
+    # arrange
+    objects = [{"id": "indicator--{}".format(i), "pattern": "a0" * 32} for i in range(0, 64)]
+    stix = [{"schema": "bundle.json", "signature": {"type": "bundle", "objects": objects}}]
+    verdict = {"malware_family": "Eicar", "domains": ["polyswarm.io"], "stix": stix}
+    payload = json.dumps([verdict] * 256).encode('utf-8')
+    executor = ThreadPoolExecutor(max_workers=2)
+    # act
+    inline = event_loop_lag(lambda data: Assertion.avalidate_json(data, threshold=len(data) + 1), payload)
+    offloaded = event_loop_lag(lambda data: Assertion.avalidate_json(data, executor=executor), payload)
+    logger.info('Event loop lag validating 4 x %d byte assertions: %.2fms inline, %.2fms offloaded',
+                len(payload), inline, offloaded)
+    # assert
+    result = asyncio.run(Assertion.avalidate_json(payload, executor=executor))
+    executor.shutdown()
+    assert result.json() == Assertion.model_validate_json(payload).json()
+
+
+def test_validate_ndjson_scaling(tmp_path):
+    # arrange
+    path = tmp_path / 'verdicts.ndjson'
+    path.write_bytes((make_verdict().json() + '\n').encode('utf-8') * 20000)
+    workers = os.cpu_count() or 1
+    # act
+    start = time.perf_counter()
+    serial = validate_ndjson(str(path), workers=1)
+    serial_time = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = validate_ndjson(str(path), workers=workers)
+    parallel_time = time.perf_counter() - start
+    logger.info('validate_ndjson (20000 verdicts): %.0fms with 1 worker, %.0fms with %d (%.2fx)',
+                serial_time * 1e3, parallel_time * 1e3, workers, serial_time / parallel_time)
+    # assert
+    assert parallel == serial
+    assert not serial.errors
+
+
+def test_archive_lookup(tmp_path):
+    # arrange
+    path = str(tmp_path / 'bounties.ndjson')
+    with open(path, 'wb') as f:
+        write_ndjson(f, (Bounty().add_file_artifact(mimetype='text/plain', sha256='{:064x}'.format(i))
+                         for i in range(0, 5000)))
+    build_index(path)
+    target = '{:064x}'.format(4321)
+
+    def scan():
+        with open(path, 'rb') as f:
+            return [bounty for bounty in read_ndjson(f, type_=Bounty) if bounty.root[0].sha256 == target]
+
+    # act
+    with Archive(path) as archive:
+        indexed = per_call(lambda: archive.find_sha256(target), number=100)
+        found = archive.find_sha256(target)
+    scanned = per_call(scan, number=1)
+    logger.info('sha256 lookup in 5000 bounties: %.2fus indexed, %.2fus scanning', indexed, scanned)
+    # assert
+    assert [bounty.json() for bounty in found] == [bounty.json() for bounty in scan()]
+
+
+def test_validation_cache_duplicates():
+    # arrange
+    payload = json.loads(make_verdict().json())
+    cache = ValidationCache()
+    # act
+    uncached = per_call(lambda: Verdict.model_validate(payload).json())
+    cached = per_call(lambda: Verdict.model_validate(payload, cache=cache).json(cache=cache))
+    logger.info('Verdict validate + json of a duplicate payload: %.2fus uncached, %.2fus cached', uncached, cached)
+    # assert
+    assert Verdict.model_validate(payload, cache=cache).json(cache=cache) == Verdict.model_validate(payload).json()
+    assert cache.stats()['misses'] == 1
+
+
+def test_decode_many_urls():
+    # arrange
+    urls = ['https://polyswarm.io/{}?query=value'.format(i).encode('ascii') for i in range(0, 1000)]
+    # act
+    single = per_call(lambda: [ArtifactType.URL.decode_content(url) for url in urls], number=100)
+    batch = per_call(lambda: ArtifactType.URL.decode_many(urls), number=100)
+    logger.info('Decoding 1000 URLs: %.2fus one at a time, %.2fus as a batch', single, batch)
+    # assert
+    assert ArtifactType.URL.decode_many(urls).results == [ArtifactType.URL.decode_content(url) for url in urls]
+
+
+def peak_allocated(fn):
+    """
+    Peak bytes allocated while running `fn`
+    """
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_scan_content_single_pass(tmp_path):
+    # arrange
+    path = tmp_path / 'sample'
+    path.write_bytes(os.urandom(1024 * 1024) * 16)
+
+    def read_whole():
+        with open(path, 'rb') as f:
+            data = f.read()
+        return hashlib.sha256(data).digest(), hashlib.sha1(data).digest(), hashlib.md5(data).digest(), len(data)
+
+    # act
+    whole = per_call(read_whole, number=3)
+    streamed = per_call(lambda: scan(path), number=3)
+    whole_peak = peak_allocated(read_whole)
+    streamed_peak = peak_allocated(lambda: scan(path))
+    logger.info('Scanning 16MB: %.0fus and %d bytes peak reading it whole, %.0fus and %d bytes peak streamed',
+                whole, whole_peak, streamed, streamed_peak)
+    # assert
+    assert scan(path)[:4] == read_whole()
+    assert streamed_peak < whole_peak / 100
+
+
+def test_bounty_from_paths(tmp_path):
+    # arrange
+    paths = []
+    for i in range(0, 16):
+        path = tmp_path / 'sample{}'.format(i)
+        path.write_bytes(os.urandom(1024 * 1024))
+        paths.append(path)
+    workers = os.cpu_count() or 1
+
+    def serial():
+        bounty = Bounty()
+        for path in paths:
+            bounty.root.append(FileArtifact.from_path(path))
+        return bounty
+
+    # act
+    serial_time = per_call(serial, number=1)
+    parallel_time = per_call(lambda: Bounty.from_paths(paths, workers=workers), number=1)
+    logger.info('Bounty of 16 x 1MB files: %.0fus serially, %.0fus with %d threads (%.2fx)',
+                serial_time, parallel_time, workers, serial_time / parallel_time)
+    # assert
+    assert Bounty.from_paths(paths, workers=workers).json() == serial().json()
+
+
+def test_add_url_artifacts_batch():
+    # arrange
+    uris = ['polyswarm.io/{}/page?query=value'.format(i % 32) for i in range(0, 256)]
+
+    def single():
+        bounty = Bounty()
+        for uri in uris:
+            bounty.add_url_artifact(uri=uri, protocol='https://')
+        return bounty
+
+    # act
+    single_time = per_call(single, number=20)
+    batch_time = per_call(lambda: Bounty().add_url_artifacts(uris, protocol='https://'), number=20)
+    logger.info('Bounty of 256 URLs: %.2fus one at a time, %.2fus as a batch', single_time, batch_time)
+    # assert
+    assert Bounty().add_url_artifacts(uris, protocol='https://').json() == single().json()
+
+
+def _import_times(code: str) -> Dict[str, int]:
+    """
+    Cumulative import time of every module imported by `code`, in microseconds, from ``-X importtime``
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True,
+                            check=True, text=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time():
+    # arrange
+    # act
+    package = _import_times('import polyswarmartifact')
+    schema = _import_times('import polyswarmartifact.schema')
+    verdict = _import_times('import polyswarmartifact.schema.verdict')
+    logger.info('Import time: %.2fms polyswarmartifact, %.2fms polyswarmartifact.schema, %.2fms with Verdict',
+                package['polyswarmartifact'] / 1000, schema['polyswarmartifact.schema'] / 1000,
+                verdict['polyswarmartifact.schema.verdict'] / 1000)
+    # assert
+    assert 'pydantic' not in package
+    assert 'pydantic' not in schema
+    assert 'polyswarmartifact.schema.bounty' not in verdict
+
+
+LEGACY_DOMAIN = constr(pattern=DOMAIN_PATTERN, min_length=3, max_length=61 + 63 + 3)
+
+HOSTILE_DOMAINS = [
+    'a' * 61 + '.' + 'b' * 63 + '!',
+    '.'.join(['a1'] * 42) + '-',
+    '-' * 127,
+    '\U00010000' * 64 + '.xn--' + 'a' * 58,
+    'a.' * 63 + '-',
+]
+
+
+def test_domain_validation():
+    # arrange
+    domains = ['polyswarm.io', 'sub.polyswarm.network', 'xn--mnchen-3ya.de'] * 100
+    legacy = TypeAdapter(List[LEGACY_DOMAIN])
+    current = TypeAdapter(List[Domain])
+    # act
+    before = per_call(lambda: legacy.validate_python(domains), number=100) / len(domains)
+    after = per_call(lambda: current.validate_python(domains), number=100) / len(domains)
+    logger.info('Domain validation: %.3fus published pattern, %.3fus character class', before, after)
+    # assert
+    assert current.validate_python(domains) == domains
+
+
+def accepts(adapter, value):
+    try:
+        adapter.validate_python(value)
+    except ValidationError:
+        return False
+    return True
+
+
+def test_domain_validation_hostile():
+    # arrange
+    legacy = TypeAdapter(LEGACY_DOMAIN)
+    current = TypeAdapter(Domain)
+
+    def validate_all():
+        for domain in HOSTILE_DOMAINS:
+            try:
+                current.validate_python(domain)
+            except ValidationError:
+                pass
+    # act
+    elapsed = per_call(validate_all) / len(HOSTILE_DOMAINS)
+    logger.info('Domain validation (hostile inputs): %.3fus per domain', elapsed)
+    # assert
+    for domain in HOSTILE_DOMAINS:
+        assert accepts(current, domain) == accepts(legacy, domain)
+
+
+
+def test_suite_results():
+    # arrange
+    # act
+    results = run(['verdict.json', 'domain.validate'], number=10)
+    # assert
+    assert set(results['results']) == {'verdict.json', 'domain.validate'}
+    assert results['meta']['pydantic']
+    assert all(result['usec_per_call'] > 0 for result in results['results'].values())
+
+
+def test_suite_compare():
+    # arrange
+    baseline = {'results': {'verdict.json': {'usec_per_call': 10.0}, 'verdict.dict': {'usec_per_call': 10.0}}}
+    results = {'results': {'verdict.json': {'usec_per_call': 25.0}, 'verdict.dict': {'usec_per_call': 11.0},
+                           'domain.validate': {'usec_per_call': 1.0}}}
+    # act
+    comparison = compare(results, baseline, threshold=1.5)
+    # assert
+    assert comparison == {
+        'verdict.json': {'ratio': 2.5, 'regressed': True},
+        'verdict.dict': {'ratio': 1.1, 'regressed': False},
+    }
+
+
+def test_suite_main(tmp_path):
+    # arrange
+    output = tmp_path / 'results.json'
+    # act
+    status = main(['--number', '10', '--output', str(output)])
+    # assert
+    assert status == 0
+    assert len(json.loads(output.read_text())['results']) > 20
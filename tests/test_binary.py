@@ -0,0 +1,119 @@
+import io
+
+import pytest
+from polyswarmartifact.exceptions import DecodeError
+from polyswarmartifact.schema import binary
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Bounty, FileArtifact
+from polyswarmartifact.schema.verdict import Verdict
+
+
+def make_verdict():
+    return Verdict().set_malware_family("Eicar")\
+        .add_domain('polyswarm.io')\
+        .add_ip_addresses(['192.168.0.1', '2001:db8::1'])\
+        .add_stix_signature('oasis-open/cti-stix2-json-schemas/master/schemas/common/hex.json',
+                            {"a": [1, -1.5, None]})\
+        .set_scanner(operating_system="windows", version="1.0.0")\
+        .set_analysis_conclusion(heuristic=True)\
+        .add_extra("new_key", {"other_key": "string_value"})
+
+
+def test_verdict_round_trip():
+    # arrange
+    verdict = make_verdict()
+    # act
+    encoded = binary.encode(verdict)
+    # assert
+    assert len(encoded) < len(verdict.json())
+    assert binary.decode(encoded).json() == verdict.json()
+
+
+def test_packed_ip_addresses():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar").add_ip_address('192.168.0.1')
+    # act
+    encoded = binary.encode(verdict)
+    # assert
+    assert b'\xc4\x04\xc0\xa8\x00\x01' in encoded
+
+
+def test_bounty_round_trip():
+    # arrange
+    bounty = Bounty()\
+        .add_file_artifact(mimetype="text/plain", filesize=1,
+                           sha256="74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a",
+                           sha1="F013D66C7F6817D08B7EB2A93E6D0440C1F3E7F8",
+                           md5="772ac1a55fab1122f3b369ee9cd31549")\
+        .add_url_artifact(protocol="https://", uri='polyswarm.io/')
+    # act
+    encoded = binary.encode(bounty)
+    decoded = binary.decode(encoded, Bounty)
+    # assert
+    assert bytes.fromhex("74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a") in encoded
+    assert decoded.json() == bounty.json()
+    assert decoded[0].sha1 == "F013D66C7F6817D08B7EB2A93E6D0440C1F3E7F8"
+
+
+def test_file_artifact_round_trip():
+    # arrange
+    artifact = FileArtifact(mimetype="text/plain", md5="772ac1a55fab1122f3b369ee9cd31549")
+    # act
+    decoded = binary.decode(binary.encode(artifact), FileArtifact)
+    # assert
+    assert decoded == artifact
+
+
+def test_stream_round_trip():
+    # arrange
+    assertions = [Assertion().add_artifacts([make_verdict(), make_verdict()]) for _ in range(0, 3)]
+    fp = io.BytesIO()
+    # act
+    count = binary.write(fp, assertions)
+    fp.seek(0)
+    decoded = list(binary.read(fp, Assertion, chunk_size=7))
+    # assert
+    assert count == 3
+    assert [assertion.json() for assertion in decoded] == [assertion.json() for assertion in assertions]
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_read_large_record():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar").add_domains(['{}.polyswarm.io'.format(i) for i in range(0, 2000)])
+    encoded = binary.encode(verdict)
+    fp = CountingReader(encoded * 2)
+    # act
+    decoded = list(binary.read(fp, chunk_size=16))
+    # assert
+    assert [record.json() for record in decoded] == [verdict.json()] * 2
+    # reads grow with the partial record, rather than one per chunk
+    assert fp.reads < 40 < len(encoded) // 16
+
+
+def test_truncated_raises():
+    # arrange
+    encoded = binary.encode(make_verdict())
+    # act
+    # assert
+    with pytest.raises(DecodeError):
+        binary.decode(encoded[:-1])
+    with pytest.raises(DecodeError):
+        list(binary.read(io.BytesIO(encoded + encoded[:-1])))
+
+
+def test_invalid_raises():
+    # arrange
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        binary.encode(Verdict())
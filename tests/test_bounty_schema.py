@@ -1,7 +1,8 @@
 import json
 
 import pytest
-from polyswarmartifact.schema.bounty import Bounty
+from polyswarmartifact.schema.bounty import Bounty, CompactFileArtifact, FileArtifact, URLArtifact
+from polyswarmartifact.schema.cache import LRUCache
 
 
 def test_valid_blob_validates_true():
@@ -150,3 +151,294 @@ def test_builder_256_scanners_is_valid():
                                  md5="772ac1a55fab1122f3b369ee9cd31549",)
     # assert
     assert Bounty.model_validate(bounty.dict())
+
+
+def test_validate_artifacts():
+    # arrange
+    blobs = [
+        {"mimetype": "text/plain", "md5": "772ac1a55fab1122f3b369ee9cd31549"},
+        {"protocol": "https://", "uri": "https://polyswarm.io/"},
+        {"filesize": "1"},
+    ]
+    # act
+    results, errors = Bounty.validate_artifacts(blobs)
+    # assert
+    assert isinstance(results[0], FileArtifact)
+    assert isinstance(results[1], URLArtifact)
+    assert results[2] is None
+    assert list(errors) == [2]
+
+
+def test_validate_many():
+    # arrange
+    blobs = [[{"mimetype": "text/plain"}], [{"filesize": "1"}]]
+    # act
+    results, errors = Bounty.validate_many(blobs)
+    # assert
+    assert results[0].artifacts[0].mimetype == "text/plain"
+    assert results[1] is None
+    assert list(errors) == [1]
+
+
+def test_from_file_artifacts():
+    # arrange
+    artifacts = [
+        {
+            "mimetype": "text/plain",
+            "sha256": "74B4147957813B62CC8987F2B711DDB31F8CB46DCBF71502033DA66053C8780A",
+            "md5": "772ac1a55fab1122f3b369ee9cd31549",
+        },
+        {
+            "mimetype": "text/plain",
+            "filesize": 1,
+            "sha1": "f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8",
+        },
+    ]
+    # act
+    bounty = Bounty.from_file_artifacts(artifacts)
+    # assert
+    assert bounty.json() == json.dumps([
+        {
+            "mimetype": "text/plain",
+            "sha256": "74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a",
+            "md5": "772ac1a55fab1122f3b369ee9cd31549",
+        },
+        {
+            "filesize": 1,
+            "mimetype": "text/plain",
+            "sha1": "f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8",
+        },
+    ], separators=(',', ':'))
+
+
+def test_from_file_artifacts_invalid_digest():
+    # arrange
+    artifacts = [
+        {"mimetype": "text/plain", "md5": "772ac1a55fab1122f3b369ee9cd31549"},
+        {"mimetype": "text/plain", "md5": "772ac1a55fab1122f3b369ee9cd3154z"},
+    ]
+    # act
+    # assert
+    with pytest.raises(ValueError, match=r'md5 for file artifacts \[1\]'):
+        Bounty.from_file_artifacts(artifacts)
+
+
+def test_from_file_artifacts_invalid_field():
+    # arrange
+    artifacts = [{"mimetype": None}]
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        Bounty.from_file_artifacts(artifacts)
+
+
+def test_from_digest_bytes():
+    # arrange
+    sha256 = bytes.fromhex("74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a")
+    md5 = bytes.fromhex("772ac1a55fab1122f3b369ee9cd31549")
+    # act
+    artifact = FileArtifact.from_digest_bytes("text/plain", sha256=sha256, md5=md5, filesize=1)
+    # assert
+    assert artifact.sha256 == "74b4147957813b62cc8987f2b711ddb31f8cb46dcbf71502033da66053c8780a"
+    assert artifact.md5 == "772ac1a55fab1122f3b369ee9cd31549"
+    assert artifact.filesize == 1
+
+
+def test_compact_file_artifact():
+    # arrange
+    sha1 = bytes.fromhex("f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8")
+    # act
+    artifact = CompactFileArtifact.from_digest_bytes("text/plain", sha1=sha1,
+                                                     md5="772AC1A55FAB1122F3B369EE9CD31549")
+    # assert
+    assert artifact.sha1 == "f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8"
+    assert artifact.md5 == "772ac1a55fab1122f3b369ee9cd31549"
+    assert artifact.sha256 is None
+    assert artifact.sha1_bytes == sha1
+    assert artifact.md5_bytes == bytes.fromhex("772ac1a55fab1122f3b369ee9cd31549")
+    assert artifact == {
+        "mimetype": "text/plain",
+        "sha1": "f013d66c7f6817d08b7eb2a93e6d0440c1f3e7f8",
+        "md5": "772ac1a55fab1122f3b369ee9cd31549",
+    }
+    assert json.loads(artifact.json()) == artifact.model_dump(exclude_defaults=True)
+
+
+def test_compact_file_artifact_assign_digest():
+    # arrange
+    artifact = CompactFileArtifact(mimetype="text/plain")
+    # act
+    artifact.md5 = "772AC1A55FAB1122F3B369EE9CD31549"
+    # assert
+    assert artifact.md5 == "772ac1a55fab1122f3b369ee9cd31549"
+    assert artifact.md5_bytes == bytes.fromhex("772ac1a55fab1122f3b369ee9cd31549")
+    with pytest.raises(ValueError):
+        artifact.sha1 = "not a digest"
+
+
+def test_compact_file_artifact_invalid_digest():
+    # arrange
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        CompactFileArtifact(mimetype="text/plain", md5=b'\x00' * 15)
+    with pytest.raises(ValueError):
+        CompactFileArtifact(mimetype="text/plain", md5="772ac1a55fab1122f3b369ee9cd3154z")
+    with pytest.raises(ValueError):
+        CompactFileArtifact(mimetype="text/plain", md5="77 2a c1 a5 5f ab 11 22 f3 b3 69 ee 9c d3 15 49")
+
+
+def test_bounty_rejects_spaced_digest():
+    # arrange
+    blob = [{"mimetype": "text/plain", "md5": "77 2a c1 a5 5f ab 11 22 f3 b3 69 ee 9c d3 15 49"}]
+    # act
+    # assert
+    assert Bounty.model_validate(blob) is False
+    with pytest.raises(ValueError):
+        Bounty.model_validate_json(json.dumps(blob))
+
+
+def test_bounty_schema_excludes_compact_file_artifact():
+    # arrange
+    # act
+    schema = Bounty.model_json_schema()
+    # assert
+    assert len(schema['items']['anyOf']) == 2
+    assert 'CompactFileArtifact' not in json.dumps(schema)
+
+
+def test_add_compact_file_artifact():
+    # arrange
+    bounty = Bounty()
+    # act
+    bounty.add_file_artifact(compact=True, mimetype="text/plain", md5="772ac1a55fab1122f3b369ee9cd31549")
+    bounty.add_file_artifact(mimetype="text/plain", md5="772ac1a55fab1122f3b369ee9cd31549")
+    # assert
+    assert isinstance(bounty[0], CompactFileArtifact)
+    assert bounty[0].json() == bounty[1].json()
+    assert [type(artifact) for artifact in Bounty.model_validate_json(bounty.json())] == [FileArtifact, FileArtifact]
+    assert [type(artifact) for artifact in Bounty.model_validate(bounty.dict())] == [FileArtifact, FileArtifact]
+    assert isinstance(Bounty.model_validate([bounty[0]])[0], CompactFileArtifact)
+
+
+def test_file_artifact_from_path(tmp_path):
+    # arrange
+    path = tmp_path / 'sample.txt'
+    path.write_bytes(b'hello world\n')
+    # act
+    artifact = FileArtifact.from_path(path)
+    compact = CompactFileArtifact.from_path(str(path), filename='renamed', mimetype='application/octet-stream')
+    # assert
+    assert artifact.filename == 'sample.txt'
+    assert artifact.filesize == 12
+    assert artifact.mimetype == 'text/plain'
+    assert artifact.sha256 == 'a948904f2f0f479b8f8197694b30184b0d2ed1c1cd2a1ec0fb85d299a192a447'
+    assert artifact.md5 == '6f5902ac237024bdd0c176cb93063dc4'
+    assert compact.filename == 'renamed'
+    assert compact.mimetype == 'application/octet-stream'
+    assert compact.sha1 == '22596363b3de40b06f981fb85d82312e8c0ed511'
+    assert compact.sha1_bytes == bytes.fromhex('22596363b3de40b06f981fb85d82312e8c0ed511')
+
+
+def test_file_artifact_from_empty_path(tmp_path):
+    # arrange
+    path = tmp_path / 'empty'
+    path.write_bytes(b'')
+    # act
+    artifact = FileArtifact.from_path(path)
+    # assert
+    assert artifact.filesize is None
+    assert artifact.sha256 == 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+
+
+def test_from_paths(tmp_path):
+    # arrange
+    paths = []
+    for i in range(0, 8):
+        path = tmp_path / 'sample{}'.format(i)
+        path.write_bytes(b'sample %d\n' % i * (i + 1))
+        paths.append(path)
+    # act
+    bounty = Bounty.from_paths(paths, workers=4)
+    compact = Bounty.from_paths(map(str, paths), workers=2, compact=True)
+    # assert
+    assert [artifact.filename for artifact in bounty] == ['sample{}'.format(i) for i in range(0, 8)]
+    assert [artifact.json() for artifact in bounty] == [FileArtifact.from_path(path).json() for path in paths]
+    assert all(isinstance(artifact, CompactFileArtifact) for artifact in compact)
+    assert json.loads(compact.json()) == json.loads(bounty.json())
+
+
+def test_url_artifact_default_protocol():
+    # arrange
+    # act
+    artifact = URLArtifact(uri='http://polyswarm.io/path')
+    blob = URLArtifact.model_validate({"uri": "ftp://polyswarm.io/"})
+    # assert
+    assert artifact.protocol == 'http://'
+    assert blob.protocol == 'ftp://'
+    assert URLArtifact(uri='http://polyswarm.io', protocol='https://').protocol == 'https://'
+
+
+def test_validate_urls():
+    # arrange
+    uris = ['polyswarm.io/a', 'http://polyswarm.io/b', 'not a url', None, 'polyswarm.io/a']
+    # act
+    results, errors = URLArtifact.validate_urls(uris, protocol='https://')
+    # assert
+    assert [str(result.uri) for result in results if result] == \
+        ['https://polyswarm.io/a', 'https://polyswarm.io/b', 'https://polyswarm.io/a']
+    assert all(result.protocol == 'https://' for result in results if result)
+    assert list(errors) == [2, 3]
+    assert results[0] is not results[4]
+
+
+def test_validate_urls_without_protocol():
+    # arrange
+    # act
+    results, errors = URLArtifact.validate_urls(['https://polyswarm.io/', 'polyswarm.io'])
+    # assert
+    assert results[0].protocol == 'https://'
+    assert list(errors) == [1]
+
+
+def test_validate_urls_cache_evicts(monkeypatch):
+    # arrange
+    from polyswarmartifact.schema import bounty as bounty_module
+    monkeypatch.setattr(bounty_module, '_url_cache', LRUCache(2))
+    # act
+    results, errors = URLArtifact.validate_urls(['a.io/1', 'a.io/2', 'a.io/3', 'a.io/3'], protocol='https://')
+    # assert
+    assert not errors
+    assert len(bounty_module._url_cache) == 2
+    assert bounty_module._url_cache.peek('https://a.io/3') is results[3].uri
+    assert bounty_module._url_cache.peek('https://a.io/1') is None
+
+
+def test_add_url_artifacts():
+    # arrange
+    bounty = Bounty()
+    # act
+    bounty.add_url_artifacts(['google.com/', 'polyswarm.io/'], protocol='https://')
+    # assert
+    expected = Bounty().add_url_artifact(protocol='https://', uri='google.com/')\
+        .add_url_artifact(protocol='https://', uri='polyswarm.io/')
+    assert bounty.json() == expected.json()
+
+
+def test_add_url_artifacts_invalid():
+    # arrange
+    bounty = Bounty()
+    # act
+    with pytest.raises(ValueError, match=r'\[1\]'):
+        bounty.add_url_artifacts(['https://google.com/', 'not a url'])
+    # assert
+    assert bounty.artifacts == []
+
+
+def test_build():
+    # arrange
+    # act
+    bounty = Bounty.build().add_url_artifact(protocol='https://', uri='polyswarm.io/')
+    # assert
+    assert bounty.check() is bounty
+    assert bounty.json() == Bounty().add_url_artifact(protocol='https://', uri='polyswarm.io/').json()
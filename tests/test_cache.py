@@ -0,0 +1,197 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.cache import LRUCache, ValidationCache, copy_validated, payload_key
+from polyswarmartifact.schema.verdict import Verdict
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    # arrange
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    # act
+    cache.get('a')
+    cache.put('c', 3)
+    # assert
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 1, 'evictions': 1, 'expirations': 0}
+
+
+def test_lru_ttl():
+    # arrange
+    clock = Clock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put('a', 1)
+    # act
+    clock.now = 5
+    fresh = cache.get('a')
+    clock.now = 10
+    stale = cache.get('a')
+    # assert
+    assert fresh == 1
+    assert stale is None
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 1
+
+
+def test_lru_on_evict():
+    # arrange
+    evicted = []
+    cache = LRUCache(maxsize=1)
+    cache.on_evict = lambda key, value: evicted.append(key)
+    cache.put('a', 1)
+    # act
+    cache.put('b', 2)
+    cache.clear()
+    # assert
+    assert evicted == ['a', 'b']
+    assert cache.stats()['hits'] == 0
+
+
+def test_lru_threads():
+    # arrange
+    cache = LRUCache(maxsize=8)
+
+    def use(thread):
+        for i in range(0, 20000):
+            key = (i * 7 + thread) % 12
+            if cache.get(key) is None:
+                cache.put(key, i)
+        return True
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    # act
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(use, range(0, 8)))
+    finally:
+        sys.setswitchinterval(interval)
+    # assert
+    assert results == [True] * 8
+    assert len(cache) == 8
+
+
+def test_model_validate_cached():
+    # arrange
+    cache = ValidationCache()
+    payload = {"malware_family": "Eicar", "domains": ["polyswarm.io"]}
+    # act
+    first = Verdict.model_validate(payload, cache=cache)
+    second = Verdict.model_validate(dict(payload), cache=cache)
+    # assert
+    assert first == second
+    assert first is not second
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_validate_json_payload():
+    # arrange
+    cache = ValidationCache()
+    payload = json.dumps([{"malware_family": "Eicar"}]).encode('utf-8')
+    # act
+    first = cache.validate(Assertion, payload)
+    second = cache.validate(Assertion, payload.decode('utf-8'))
+    # assert
+    assert isinstance(first, Assertion)
+    assert first == second
+    assert first[0] is not second[0]
+
+
+def test_types_cached_separately():
+    # arrange
+    payload = [{"malware_family": "Eicar"}]
+    # act
+    # assert
+    assert payload_key(Assertion, payload) != payload_key(Verdict, payload)
+
+
+def test_invalid_payload_not_cached():
+    # arrange
+    cache = ValidationCache()
+    # act
+    result = Verdict.model_validate({"malware_family": 1}, cache=cache)
+    # assert
+    assert result is False
+    assert len(cache) == 0
+    with pytest.raises(ValidationError):
+        cache.validate(Verdict, {"malware_family": 1})
+
+
+def test_json_cached():
+    # arrange
+    cache = ValidationCache()
+    verdict = Verdict.model_validate({"malware_family": "Eicar"}, cache=cache)
+    # act
+    first = verdict.json(cache=cache)
+    cached = cache.get_json(verdict)
+    second = verdict.json(cache=cache)
+    # assert
+    assert first == second == cached == Verdict().set_malware_family("Eicar").json()
+    assert cache.get_json(Verdict().set_malware_family("Eicar")) is None
+
+
+def test_cached_model_not_shared():
+    # arrange
+    cache = ValidationCache()
+    payload = {"malware_family": "Eicar"}
+    verdict = Verdict.model_validate(payload, cache=cache)
+    verdict.json(cache=cache)
+    # act
+    verdict.add_domain('polyswarm.io')
+    other = Verdict.model_validate(payload, cache=cache)
+    # assert
+    assert json.loads(verdict.json(cache=cache)) == {"malware_family": "Eicar", "domains": ["polyswarm.io"]}
+    assert other.domains == []
+    assert json.loads(other.json(cache=cache)) == {"malware_family": "Eicar"}
+
+
+def test_copy_validated():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar").add_domain('polyswarm.io').set_scanner(environment={'os': 'x'})
+    # act
+    copied = copy_validated(verdict)
+    # assert
+    assert copied == verdict
+    assert copied.domains is not verdict.domains
+    assert copied.scanner.environment is not verdict.scanner.environment
+    assert copied.json() == verdict.json()
+
+
+def test_str_payload_same_as_uncached():
+    # arrange
+    cache = ValidationCache()
+    payload = '{"malware_family": "Eicar"}'
+    # act
+    # assert
+    assert Verdict.model_validate(payload) is False
+    assert Verdict.model_validate(payload, cache=cache) is False
+    assert len(cache) == 0
+
+
+def test_evicted_model_forgotten():
+    # arrange
+    cache = ValidationCache(maxsize=1)
+    verdict = Verdict.model_validate({"malware_family": "Eicar"}, cache=cache)
+    verdict.json(cache=cache)
+    # act
+    Verdict.model_validate({"malware_family": "Trojan"}, cache=cache)
+    # assert
+    assert cache.get_json(verdict) is None
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,121 @@
+import io
+import json
+
+import pytest
+from pydantic import ValidationError
+from polyswarmartifact.exceptions import DecodeError
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.columnar import VerdictBatch
+from polyswarmartifact.schema.verdict import Verdict
+
+
+def make_assertions():
+    return [
+        Assertion().add_artifacts([
+            Verdict().set_malware_family('Eicar').add_domains(['polyswarm.io', 'polyswarm.network'])
+            .set_scanner(version='1.0.0', vendor_version='2.0.0'),
+            Verdict().set_malware_family('Trojan').add_ip_address('192.168.0.1').set_analysis_conclusion(True),
+        ]),
+        Assertion().add_artifacts([
+            Verdict().set_malware_family('Eicar'),
+        ]),
+    ]
+
+
+def test_from_assertions_columns():
+    # arrange
+    assertions = make_assertions()
+    # act
+    batch = VerdictBatch.from_assertions(assertions)
+    # assert
+    assert len(batch) == 3
+    assert batch.assertion_count == 2
+    assert batch.malware_family == ['Eicar', 'Trojan', 'Eicar']
+    assert batch.heuristic == [None, True, None]
+    assert batch.scanner_version == ['1.0.0', None, None]
+    assert batch.vendor_version == ['2.0.0', None, None]
+    assert batch.domains == ['polyswarm.io', 'polyswarm.network']
+    assert list(batch.domain_offsets) == [0, 2, 2, 2]
+    assert list(batch.ip_address_offsets) == [0, 0, 1, 1]
+    assert list(batch.assertion_offsets) == [0, 2, 3]
+
+
+def test_round_trip():
+    # arrange
+    assertions = make_assertions()
+    batch = VerdictBatch.from_assertions(json.loads(assertion.json()) for assertion in assertions)
+    # act
+    converted = batch.to_assertions()
+    # assert
+    assert [assertion.json() for assertion in converted] == [assertion.json() for assertion in assertions]
+
+
+def test_from_ndjson():
+    # arrange
+    assertions = make_assertions()
+    fp = io.BytesIO(b'\n'.join([assertions[0].json().encode('utf-8'), b'', b'{"malware_family": "Worm"}']))
+    # act
+    batch = VerdictBatch.from_ndjson(fp)
+    # assert
+    assert batch.malware_family == ['Eicar', 'Trojan', 'Worm']
+    assert list(batch.assertion_offsets) == [0, 2, 3]
+
+
+def test_from_ndjson_invalid():
+    # arrange
+    fp = io.BytesIO(b'{"malware_family": "Eicar"}\n[1, 2]\n')
+    # act
+    # assert
+    with pytest.raises(DecodeError, match='line 2'):
+        VerdictBatch.from_ndjson(fp)
+
+
+def test_filter():
+    # arrange
+    batch = VerdictBatch.from_assertions(make_assertions())
+    # act
+    eicar = batch.filter(malware_family='Eicar')
+    heuristic = batch.filter(heuristic=True)
+    domains = batch.filter(predicate=lambda view: bool(view.domains))
+    # assert
+    assert eicar.malware_family == ['Eicar', 'Eicar']
+    assert list(eicar.assertion_offsets) == [0, 1, 2]
+    assert eicar.domains == ['polyswarm.io', 'polyswarm.network']
+    assert heuristic.malware_family == ['Trojan']
+    assert list(heuristic.assertion_offsets) == [0, 1, 1]
+    assert domains.malware_family == ['Eicar']
+
+
+def test_group_by():
+    # arrange
+    batch = VerdictBatch.from_assertions(make_assertions())
+    # act
+    groups = batch.group_by()
+    # assert
+    assert {family: list(rows) for family, rows in groups.items()} == {'Eicar': [0, 2], 'Trojan': [1]}
+    with pytest.raises(ValueError):
+        batch.group_by('domains')
+
+
+def test_row_access():
+    # arrange
+    batch = VerdictBatch.from_assertions(make_assertions())
+    # act
+    view = batch[1]
+    # assert
+    assert view.malware_family == 'Trojan'
+    assert view.ip_addresses == ('192.168.0.1',)
+    assert batch.row(-1) == {'malware_family': 'Eicar'}
+    assert batch.assertion_of(1) == 0
+    assert batch.assertion_of(2) == 1
+    with pytest.raises(IndexError):
+        batch.row(3)
+
+
+def test_to_assertions_invalid():
+    # arrange
+    batch = VerdictBatch.from_verdicts([{'domains': ['polyswarm.io']}])
+    # act
+    # assert
+    with pytest.raises(ValidationError):
+        batch.to_assertions()
@@ -0,0 +1,112 @@
+import hashlib
+import io
+import subprocess
+import sys
+
+import pytest
+from polyswarmartifact import ArtifactType
+from polyswarmartifact.content import ContentInfo, iter_chunks, scan, sniff_mimetype
+
+DATA = b''.join(bytes([i % 251]) for i in range(0, 100000))
+
+
+def expected(data, mimetype):
+    return ContentInfo(hashlib.sha256(data).digest(), hashlib.sha1(data).digest(), hashlib.md5(data).digest(),
+                       len(data), mimetype)
+
+
+def test_iter_chunks_path(tmp_path):
+    # arrange
+    path = tmp_path / 'sample'
+    path.write_bytes(DATA)
+    # act
+    chunks = [bytes(chunk) for chunk in iter_chunks(str(path), chunk_size=4096)]
+    # assert
+    assert b''.join(chunks) == DATA
+    assert {len(chunk) for chunk in chunks[:-1]} == {4096}
+    assert len(chunks[-1]) == len(DATA) % 4096
+
+
+def test_iter_chunks_file_object_position(tmp_path):
+    # arrange
+    path = tmp_path / 'sample'
+    path.write_bytes(DATA)
+    # act
+    with open(path, 'rb') as fp:
+        fp.seek(10)
+        data = b''.join(bytes(chunk) for chunk in ArtifactType.FILE.iter_content(fp, chunk_size=4096))
+        position = fp.tell()
+    # assert
+    assert data == DATA[10:]
+    assert position == len(DATA)
+
+
+def test_iter_chunks_unmappable():
+    # arrange
+    fp = io.BytesIO(DATA)
+    # act
+    chunks = list(iter_chunks(fp, chunk_size=4096))
+    # assert
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert b''.join(chunks) == DATA
+
+
+def test_scan_path(tmp_path):
+    # arrange
+    path = tmp_path / 'sample'
+    path.write_bytes(DATA)
+    # act
+    info = ArtifactType.FILE.scan_content(path, chunk_size=4096)
+    # assert
+    assert info == expected(DATA, 'application/octet-stream')
+
+
+def test_scan_empty(tmp_path):
+    # arrange
+    path = tmp_path / 'empty'
+    path.write_bytes(b'')
+    # act
+    info = scan(str(path))
+    # assert
+    assert info == expected(b'', 'application/x-empty')
+
+
+def test_scan_file_object():
+    # arrange
+    data = b'hello world\n' * 1000
+    # act
+    info = scan(io.BytesIO(data), chunk_size=1000)
+    # assert
+    assert info == expected(data, 'text/plain')
+
+
+@pytest.mark.parametrize('head,mimetype', [
+    (b'%PDF-1.7\n', 'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n\x00\x00', 'image/png'),
+    (b'PK\x03\x04\x14\x00', 'application/zip'),
+    (b'MZ\x90\x00\x03\x00', 'application/x-dosexec'),
+    (b'\x7fELF\x02\x01', 'application/x-executable'),
+    (b'\x00' * 257 + b'ustar\x00', 'application/x-tar'),
+    (b'plain text\tfile\r\n', 'text/plain'),
+    ('café'.encode('utf-8'), 'text/plain'),
+    ('café'.encode('utf-8')[:-1], 'text/plain'),
+    (b'\x00\x01\x02binary', 'application/octet-stream'),
+    (b'\xff\xfe\xfa', 'application/octet-stream'),
+])
+def test_sniff_mimetype(head, mimetype):
+    # arrange
+    # act
+    # assert
+    assert sniff_mimetype(head) == mimetype
+
+
+def test_content_does_not_import_pydantic(tmp_path):
+    # arrange
+    path = tmp_path / 'sample'
+    path.write_bytes(DATA)
+    code = 'import sys; from polyswarmartifact import ArtifactType; ' \
+           'ArtifactType.FILE.scan_content(sys.argv[1]); print("pydantic" in sys.modules)'
+    # act
+    output = subprocess.run([sys.executable, '-c', code, str(path)], capture_output=True, check=True).stdout
+    # assert
+    assert output.strip() == b'False'
@@ -0,0 +1,40 @@
+from polyswarmartifact.schema.digest import normalize_digests
+
+MD5 = '772ac1a55fab1122f3b369ee9cd31549'
+
+
+def test_normalize_valid_batch():
+    # arrange
+    values = [MD5, None, MD5.upper()]
+    # act
+    normalized, mask = normalize_digests(values, 32)
+    # assert
+    assert normalized == [MD5, None, MD5]
+    assert mask == [True, True, True]
+
+
+def test_normalize_invalid_items():
+    # arrange
+    values = [MD5, MD5[:-1], MD5[:-1] + 'g', MD5 + '0', 1, MD5[:-1] + 'é', MD5[:-2], MD5]
+    # act
+    normalized, mask = normalize_digests(values, 32)
+    # assert
+    assert normalized == [MD5, None, None, None, None, None, None, MD5]
+    assert mask == [True, False, False, False, False, False, False, True]
+
+
+def test_normalize_mismatched_lengths():
+    # arrange
+    # lengths add up to a whole number of digests, but neither is the right length
+    values = [MD5[:-1], MD5 + '0']
+    # act
+    normalized, mask = normalize_digests(values, 32)
+    # assert
+    assert mask == [False, False]
+
+
+def test_normalize_empty():
+    # arrange
+    # act
+    # assert
+    assert normalize_digests([], 64) == ([], [])
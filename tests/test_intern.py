@@ -0,0 +1,53 @@
+import pytest
+from polyswarmartifact.schema import intern
+from polyswarmartifact.schema.verdict import Verdict
+
+
+@pytest.fixture
+def table():
+    table = intern.enable_interning(maxsize=3)
+    yield table
+    intern.disable_interning()
+
+
+def test_disabled_by_default():
+    # arrange
+    # act
+    # assert
+    assert intern.get_intern_table() is None
+    assert intern.intern_string('Eicar') == 'Eicar'
+
+
+def test_interns_decoded_fields(table):
+    # arrange
+    blob = b'{"malware_family": "Eicar", "scanner": {"vendor_version": "1.0.0", "signatures_version": "2019"},' \
+           b' "stix": [{"schema": "oasis-open/cti-stix2-json-schemas/master/schemas/common/hex.json",' \
+           b' "signature": "a0"}]}'
+    # act
+    first = Verdict.model_validate_json(blob)
+    second = Verdict.model_validate_json(blob)
+    # assert
+    assert first.malware_family is second.malware_family
+    assert first.scanner.vendor_version is second.scanner.vendor_version
+    assert table.stats() == {'size': 3, 'maxsize': 3, 'hits': 3, 'misses': 5, 'rejected': 2}
+
+
+def test_interns_python_input(table):
+    # arrange
+    family = ''.join(['Ei', 'car'])
+    # act
+    verdict = Verdict.model_validate({"malware_family": family})
+    other = Verdict.model_validate({"malware_family": ''.join(['Ei', 'car'])})
+    # assert
+    assert other.malware_family is verdict.malware_family
+    assert len(table) == 1
+
+
+def test_clear(table):
+    # arrange
+    table.intern('Eicar')
+    # act
+    table.clear()
+    # assert
+    assert len(table) == 0
+    assert table.stats()['misses'] == 0
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.parallel import _array_ranges, _read_lines, validate_ndjson
+from polyswarmartifact.schema.verdict import Verdict
+
+VERDICTS = [{"malware_family": "family{}".format(i), "domains": ["polyswarm.io"]} for i in range(0, 50)]
+
+
+def write_ndjson(path, records):
+    path.write_bytes(b'\n'.join(json.dumps(record).encode('utf-8') for record in records) + b'\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_ndjson(tmp_path, workers):
+    # arrange
+    records = list(VERDICTS)
+    records[7] = {"malware_family": 7}
+    path = write_ndjson(tmp_path / 'verdicts.ndjson', records)
+    # act
+    results, errors = validate_ndjson(path, workers=workers)
+    # assert
+    assert len(results) == 50
+    assert results[7] is None
+    assert list(errors) == [7]
+    assert errors[7][0]['loc'] == ('malware_family',)
+    assert [json.loads(result)['malware_family'] for result in results if result] == \
+        ['family{}'.format(i) for i in range(0, 50) if i != 7]
+
+
+def test_validate_ndjson_invalid_json(tmp_path):
+    # arrange
+    path = tmp_path / 'verdicts.ndjson'
+    path.write_bytes(b'{"malware_family": "Eicar"}\n\nnot json\n{"malware_family": "Trojan"}')
+    # act
+    results, errors = validate_ndjson(str(path), workers=1)
+    # assert
+    assert results[0] == b'{"malware_family":"Eicar"}'
+    assert results[1] is None
+    assert errors[1][0]['type'] == 'json_invalid'
+    assert Verdict.model_validate_json(results[2]).malware_family == "Trojan"
+
+
+def test_validate_json_array(tmp_path):
+    # arrange
+    path = tmp_path / 'assertions.json'
+    path.write_text(json.dumps([VERDICTS[:2], VERDICTS[2:3], [{"domains": []}]]))
+    # act
+    results, errors = validate_ndjson(str(path), type_=Assertion, workers=2)
+    # assert
+    assert len(results) == 3
+    assert Assertion.model_validate_json(results[0]).json() == Assertion.model_validate(VERDICTS[:2]).json()
+    assert list(errors) == [2]
+
+
+def test_read_lines_ranges(tmp_path):
+    # arrange
+    path = tmp_path / 'lines.ndjson'
+    path.write_bytes(b'aa\nbbbb\n\ncc\nd')
+    size = path.stat().st_size
+    # act
+    chunks = [_read_lines(str(path), start, min(start + 3, size)) for start in range(0, size, 3)]
+    # assert
+    assert [line for chunk in chunks for line in chunk] == [b'aa', b'bbbb', b'cc', b'd']
+
+
+def test_array_ranges():
+    # arrange
+    items = [{"a": "x,]}"}, [1, [2, {"b": "\\\""}]], "[", {"c": [[[[[[[[[[[1]]]]]]]]]]]}, 3, None]
+    data = json.dumps(items).encode('utf-8')
+    # act
+    ranges = _array_ranges(data, len(data))
+    # assert
+    assert [json.loads(b'[' + data[start:end] + b']') for start, end in ranges] == [[item] for item in items]
+
+
+def test_array_ranges_chunks():
+    # arrange
+    data = b' [ ' + b', '.join(json.dumps(verdict).encode('utf-8') for verdict in VERDICTS) + b' ]\n'
+    # act
+    ranges = _array_ranges(data, 4)
+    # assert
+    assert len(ranges) == 4
+    assert [item for start, end in ranges for item in json.loads(b'[' + data[start:end] + b']')] == VERDICTS
+
+
+@pytest.mark.parametrize('data', [b'{}', b'[1, 2', b'[1, "2]', b'[1} ', b'[1] 2'])
+def test_array_ranges_invalid(data):
+    # arrange
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        _array_ranges(data, 2)
@@ -0,0 +1,92 @@
+import io
+import json
+
+import pytest
+from polyswarmartifact.exceptions import DecodeError
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.bounty import Artifact, FileArtifact, URLArtifact
+from polyswarmartifact.schema.schema import RawJSON
+from polyswarmartifact.schema.stream import InvalidRecord, read_ndjson, write_ndjson
+from polyswarmartifact.schema.verdict import Verdict
+
+
+def test_verdict_round_trip():
+    # arrange
+    verdicts = [
+        Verdict().set_malware_family("Eicar").add_domain('polyswarm.io'),
+        Verdict().set_malware_family("Trojan").add_ip_address('192.168.0.1'),
+    ]
+    fp = io.BytesIO()
+    # act
+    count = write_ndjson(fp, verdicts)
+    fp.seek(0)
+    # assert
+    assert count == 2
+    assert [verdict.json() for verdict in read_ndjson(fp)] == [verdict.json() for verdict in verdicts]
+
+
+def test_raw_json_round_trip():
+    # arrange
+    bundle = {"type": "bundle", "objects": [{"id": "indicator--1", "pattern": "[file:name = 'a\\nb']"}]}
+    raw = RawJSON(json.dumps(bundle, indent=2))
+    verdict = Verdict().set_malware_family("Eicar").add_stix_signature('bundle.json', raw)
+    fp = io.BytesIO()
+    # act
+    write_ndjson(fp, [verdict, verdict])
+    fp.seek(0)
+    # assert
+    assert len(fp.getvalue().splitlines()) == 2
+    assert [record.stix[0].signature for record in read_ndjson(fp)] == [bundle] * 2
+
+
+def test_assertion_round_trip():
+    # arrange
+    assertion = Assertion().add_artifact(Verdict().set_malware_family("Eicar"))
+    fp = io.BytesIO()
+    # act
+    write_ndjson(fp, [assertion, assertion])
+    fp.seek(0)
+    # assert
+    assert [record.json() for record in read_ndjson(fp, Assertion)] == [assertion.json()] * 2
+
+
+def test_artifact_union():
+    # arrange
+    fp = io.BytesIO(b'{"mimetype": "text/plain"}\n\n{"protocol": "https://", "uri": "https://polyswarm.io"}\n')
+    # act
+    artifacts = list(read_ndjson(fp, Artifact))
+    # assert
+    assert isinstance(artifacts[0], FileArtifact)
+    assert isinstance(artifacts[1], URLArtifact)
+
+
+def test_invalid_record_raises():
+    # arrange
+    fp = io.BytesIO(b'{"malware_family": "Eicar"}\n{"malware_family": 1}\n')
+    # act
+    records = read_ndjson(fp)
+    # assert
+    assert next(records).malware_family == "Eicar"
+    with pytest.raises(DecodeError):
+        next(records)
+
+
+def test_invalid_record_skipped():
+    # arrange
+    fp = io.BytesIO(b'{"malware_family": 1}\nnot json\n{"malware_family": "Eicar"}\n')
+    # act
+    records = list(read_ndjson(fp, skip_invalid=True))
+    # assert
+    assert isinstance(records[0], InvalidRecord) and records[0].line == 1
+    assert records[0].errors[0]['loc'] == ('malware_family',)
+    assert isinstance(records[1], InvalidRecord) and records[1].data == b'not json'
+    assert records[2].malware_family == "Eicar"
+
+
+def test_write_invalid_raises():
+    # arrange
+    fp = io.BytesIO()
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        write_ndjson(fp, [Verdict()])
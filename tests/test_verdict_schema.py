@@ -1,8 +1,17 @@
+import copy
+import itertools
 import json
 import logging
+import pickle
+import re
+import subprocess
+import sys
+
 import pytest
+from pydantic import TypeAdapter, ValidationError
 
-from polyswarmartifact.schema.verdict import Verdict
+from polyswarmartifact.schema.schema import RawJSON
+from polyswarmartifact.schema.verdict import StixSignature, Verdict
 
 logger = logging.getLogger(__name__)
 
@@ -1083,3 +1092,399 @@ def test_extra_object_environment():
     }
     # assert
     assert Verdict.model_validate(blob)
+
+
+def test_json_without_validation():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")\
+        .add_domain('polyswarm.io')\
+        .add_ip_address('192.168.0.1')
+    # act
+    blob = verdict.json(validate=False)
+    # assert
+    assert blob == verdict.json()
+
+
+def test_json_without_validation_skips_checks():
+    # arrange
+    verdict = Verdict()
+    # act
+    # assert
+    assert json.loads(verdict.json(validate=False)) == {"malware_family": None}
+
+
+@pytest.mark.parametrize('domain', [
+    'polyswarm.io',
+    'polyswarm.network',
+    'Polyswarm.IO',
+    'sub.polyswarm.io.',
+    '_dmarc.polyswarm.io',
+    'xn--mnchen-3ya.de',
+    'münchen.de',
+    '192.168.0.1',
+])
+def test_validate_valid_domain(domain):
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")
+    # act
+    verdict.add_domain(domain)
+    # assert
+    assert Verdict.model_validate(json.loads(verdict.json()))
+
+
+@pytest.mark.parametrize('domain', [
+    'io',
+    '{}.io'.format('a' * 125),
+    '---',
+    '...',
+    'POLYSWARM.IO',
+    '\U00050000' * 3,
+])
+def test_validate_invalid_domain(domain):
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")
+    # act
+    verdict.add_domain(domain)
+    # assert
+    with pytest.raises(ValueError):
+        verdict.json()
+
+
+@pytest.mark.parametrize('domain', [
+    '*.polyswarm.io',
+    '*.io',
+    'polyswarm.io:8080',
+    'sub.polyswarm.io:443',
+    'http://polyswarm.io/x',
+    'polyswarm..io',
+    'xn--a.io',
+])
+def test_validate_wildcard_and_port_domain(domain):
+    # the published pattern is not anchored, so it accepts any string holding a label
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")
+    # act
+    verdict.add_domain(domain)
+    # assert
+    assert json.loads(verdict.json())['domains'] == [domain]
+
+
+def test_domain_matches_published_pattern():
+    # arrange
+    from polyswarmartifact.schema.schema import DOMAIN_PATTERN, Domain
+    adapter = TypeAdapter(Domain)
+    pattern = re.compile(DOMAIN_PATTERN)
+    candidates = [''.join(chars) for length in range(2, 5) for chars in itertools.product('aZ9_-.:*ü', repeat=length)]
+
+    def accepted(domain):
+        try:
+            adapter.validate_python(domain)
+        except ValidationError:
+            return False
+        return True
+
+    # act
+    # assert
+    for domain in candidates:
+        assert accepted(domain) == (pattern.search(domain) is not None and len(domain) >= 3), domain
+    assert adapter.json_schema()['pattern'] == DOMAIN_PATTERN
+
+
+def test_get_schema_cached():
+    # arrange
+    # act
+    schema = Verdict.get_schema()
+    # assert
+    assert schema == Verdict.model_json_schema()
+    assert Verdict.get_schema_bytes() is Verdict.get_schema_bytes()
+    assert json.loads(Verdict.get_schema_bytes()) == schema
+
+
+def test_get_schema_copy():
+    # arrange
+    schema = Verdict.get_schema()
+    # act
+    schema['properties'].clear()
+    schema['title'] = 'Modified'
+    # assert
+    assert Verdict.get_schema() == Verdict.model_json_schema()
+    assert json.loads(Verdict.get_schema_bytes()) == Verdict.model_json_schema()
+
+
+def test_get_schema_rebuilt():
+    # arrange
+    schema_bytes = Verdict.get_schema_bytes()
+    # act
+    Verdict.model_rebuild(force=True)
+    # assert
+    assert Verdict.get_schema_bytes() is not schema_bytes
+    assert Verdict.get_schema_bytes() == schema_bytes
+
+
+def test_get_schema_disk_cache(tmp_path, monkeypatch):
+    # arrange
+    from polyswarmartifact.schema import schema as schema_module
+    monkeypatch.setenv(schema_module.SCHEMA_CACHE_ENV, str(tmp_path))
+    monkeypatch.setattr(schema_module, '_schema_cache', {})
+    # act
+    schema_bytes = Verdict.get_schema_bytes()
+    # assert
+    cached, = tmp_path.iterdir()
+    assert cached.read_bytes() == schema_bytes
+    # act
+    monkeypatch.setattr(schema_module, '_schema_cache', {})
+    cached.write_bytes(b'{"cached": true}')
+    # assert
+    assert Verdict.get_schema() == {"cached": True}
+
+
+def test_get_schema_deferred_build():
+    # arrange
+    code = 'from polyswarmartifact.schema import Verdict; complete = Verdict.__pydantic_complete__; ' \
+           'schema = Verdict.get_schema_bytes(); print(complete, Verdict.get_schema_bytes() is schema)'
+    # act
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+    # assert
+    assert output.split() == [b'False', b'True']
+
+
+def test_dump_deferred_build():
+    # arrange
+    code = 'from polyswarmartifact.schema import Verdict; ' \
+           'print(Verdict().set_malware_family("Eicar").dump_json().decode())'
+    # act
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+    # assert
+    assert json.loads(output) == {'malware_family': 'Eicar'}
+
+
+def test_empty_verdict_keeps_class_validator():
+    # arrange
+    # act
+    verdict = Verdict()
+    # assert
+    assert '__pydantic_validator__' not in verdict.__dict__
+    assert verdict.__pydantic_validator__ is Verdict.__pydantic_validator__
+
+
+def test_deepcopy_deferred_build():
+    # arrange
+    code = 'import copy; from polyswarmartifact.schema import Verdict; verdict = Verdict(); ' \
+           'print(copy.deepcopy(verdict) == verdict, verdict.model_copy(deep=True) == verdict)'
+    # act
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+    # assert
+    assert output.split() == [b'True', b'True']
+
+
+def test_pickle_deferred_build():
+    # arrange
+    code = 'import pickle; from polyswarmartifact.schema import Verdict; verdict = Verdict(); ' \
+           'print(pickle.loads(pickle.dumps(verdict)) == verdict)'
+    # act
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout
+    # assert
+    assert output.split() == [b'True']
+
+
+def test_schema_lazy_attributes():
+    # arrange
+    import polyswarmartifact.schema
+    # act
+    # assert
+    assert polyswarmartifact.schema.Verdict is Verdict
+    assert 'Verdict' in dir(polyswarmartifact.schema)
+    with pytest.raises(AttributeError):
+        polyswarmartifact.schema.Unknown
+
+
+def test_build():
+    # arrange
+    expected = Verdict(malware_family="Eicar", domains=['polyswarm.io'], ip_addresses=['192.168.0.1'])
+    # act
+    verdict = Verdict.build(malware_family="Eicar", domains=['polyswarm.io'], ip_addresses=['192.168.0.1'])
+    # assert
+    assert verdict.json() == expected.json()
+
+
+def test_build_chained():
+    # arrange
+    # act
+    verdict = Verdict.build()\
+        .set_malware_family("Eicar")\
+        .add_domain('polyswarm.io')\
+        .set_scanner(version="1.0.0")
+    # assert
+    assert verdict.check() is verdict
+    assert json.loads(verdict.json(validate=False)) == {
+        "malware_family": "Eicar",
+        "domains": ["polyswarm.io"],
+        "scanner": {"version": "1.0.0"},
+    }
+
+
+def test_build_skips_validation():
+    # arrange
+    # act
+    verdict = Verdict.build(domains=['not a domain'])
+    # assert
+    assert verdict.malware_family is None
+    with pytest.raises(ValueError):
+        verdict.check()
+
+
+def test_validate_class_method():
+    # arrange
+    # act
+    with pytest.warns(DeprecationWarning):
+        verdict = Verdict.validate({'malware_family': 'Eicar'})
+    # assert
+    assert isinstance(verdict, Verdict)
+    assert verdict.malware_family == 'Eicar'
+
+
+def test_equals_dict():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")\
+        .add_domain('polyswarm.io')\
+        .set_scanner(version="1.0.0")\
+        .add_extra("new_key", "string_value")
+    # act
+    # assert
+    assert verdict == verdict.model_dump(exclude_defaults=True)
+    assert verdict == {
+        "malware_family": "Eicar",
+        "domains": ["polyswarm.io"],
+        "scanner": {"version": "1.0.0"},
+        "new_key": "string_value",
+    }
+    assert verdict != {"malware_family": "Eicar", "domains": ["polyswarm.io"], "scanner": {"version": "1.0.0"}}
+    assert verdict != {**verdict.model_dump(exclude_defaults=True), "heuristic": None}
+    assert verdict != {**verdict.model_dump(exclude_defaults=True), "malware_family": "Trojan"}
+
+
+def test_equals_dict_skips_validation():
+    # arrange
+    verdict = Verdict().add_domain('polyswarm.io')
+    # act
+    # assert
+    assert verdict == {"malware_family": None, "domains": ["polyswarm.io"]}
+
+
+def test_fingerprint():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar").add_domain('polyswarm.io').add_extra("new_key", 1)
+    same = Verdict.model_validate({"new_key": 1, "domains": ["polyswarm.io"], "malware_family": "Eicar"})
+    other = Verdict().set_malware_family("Trojan").add_domain('polyswarm.io')
+    # act
+    fingerprint = verdict.fingerprint()
+    # assert
+    assert fingerprint == same.fingerprint()
+    assert fingerprint != other.fingerprint()
+    assert len({verdict.fingerprint(), same.fingerprint(), other.fingerprint()}) == 2
+
+
+def test_add_stix_raw_json():
+    # arrange
+    raw = RawJSON(b'{"type": "bundle", "objects": [{"id": "indicator--1"}]}')
+    verdict = Verdict().set_malware_family("Eicar")
+    # act
+    verdict.add_stix_signature('oasis-open/cti-stix2-json-schemas/master/schemas/common/bundle.json', raw)
+    blob = verdict.json()
+    # assert
+    assert not raw.parsed
+    assert '"signature":{"type": "bundle", "objects": [{"id": "indicator--1"}]}' in blob
+    assert Verdict.model_validate(json.loads(blob)).stix[0].signature == {
+        "type": "bundle",
+        "objects": [{"id": "indicator--1"}],
+    }
+
+
+def test_stix_raw_json_parsed_on_access():
+    # arrange
+    raw = RawJSON('["a0"]')
+    verdict = Verdict().set_malware_family("Eicar").add_stix_signature('hex.json', raw)
+    # act
+    signature = verdict.stix[0]['signature']
+    # assert
+    assert signature is raw
+    assert not raw.parsed
+    assert signature.value == ["a0"]
+    assert raw.parsed
+    assert verdict.dict()['stix'][0]['signature'] == ["a0"]
+
+
+def test_stix_raw_json_copy():
+    # arrange
+    raw = RawJSON('["a0"]')
+    verdict = Verdict().set_malware_family("Eicar").add_stix_signature('hex.json', raw)
+    # act
+    copied = copy.deepcopy(verdict)
+    pickled = pickle.loads(pickle.dumps(verdict))
+    # assert
+    for other in (copied, pickled):
+        signature = other.stix[0].signature
+        assert not signature.parsed
+        assert signature.value == ["a0"]
+        assert other.json() == verdict.json()
+
+
+def test_stix_raw_json_invalid():
+    # arrange
+    signature = StixSignature.build(stix_schema='bundle.json', signature=RawJSON(b'{bad'))
+    verdict = Verdict.build(malware_family="Eicar", stix=[signature])
+    # act
+    # assert
+    with pytest.raises(ValidationError):
+        Verdict().set_malware_family("Eicar").add_stix_signature('bundle.json', RawJSON(b'{bad'))
+    for validating in (verdict.json, verdict.dump_json, verdict.check):
+        with pytest.raises(ValidationError):
+            validating()
+    assert verdict.json(validate=False).endswith('"signature":{bad}]}')
+
+
+def test_dump_profiles():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar").add_domain('polyswarm.io').add_ip_address('192.168.0.1')\
+        .add_stix_signature('hex.json', 'a0')
+    # act
+    wire = verdict.dump()
+    storage = verdict.dump('storage')
+    index = verdict.dump('index', mode='json')
+    # assert
+    assert wire == verdict.model_dump(by_alias=True, exclude_defaults=True)
+    assert storage == verdict.model_dump(by_alias=True)
+    assert storage['heuristic'] is None
+    assert index == {"malware_family": "Eicar", "domains": ['polyswarm.io'], "ip_addresses": ['192.168.0.1']}
+
+
+def test_dump_json_profile():
+    # arrange
+    raw = RawJSON(b'{"type": "bundle"}')
+    verdict = Verdict().set_malware_family("Eicar").add_stix_signature('bundle.json', raw)
+    # act
+    wire = verdict.dump_json()
+    index = verdict.dump_json('index')
+    # assert
+    assert wire == verdict.json().encode('utf-8')
+    assert not raw.parsed
+    assert json.loads(index) == {"malware_family": "Eicar", "domains": [], "ip_addresses": []}
+
+
+def test_dump_unknown_profile():
+    # arrange
+    verdict = Verdict().set_malware_family("Eicar")
+    # act
+    # assert
+    with pytest.raises(ValueError):
+        verdict.dump('unknown')
+
+
+def test_dump_validates():
+    # arrange
+    verdict = Verdict.build(malware_family="Eicar", domains=['-'])
+    # act
+    # assert
+    with pytest.raises(ValidationError):
+        verdict.dump()
+    assert verdict.dump(validate=False)['domains'] == ['-']
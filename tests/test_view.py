@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+from polyswarmartifact.schema.assertion import Assertion
+from polyswarmartifact.schema.verdict import Verdict
+from polyswarmartifact.schema.view import VerdictView
+
+
+def make_verdict():
+    return Verdict().set_malware_family('Eicar')\
+        .add_domains(['polyswarm.io', 'polyswarm.network'])\
+        .add_ip_address('192.168.0.1')\
+        .add_stix_signature('oasis-open/cti-stix2-json-schemas/master/schemas/common/hex.json', 'a0')\
+        .set_scanner(operating_system='windows', architecture='x86', version='1.0.0')
+
+
+def test_from_json():
+    # arrange
+    verdict = make_verdict()
+    # act
+    view = VerdictView.from_json(verdict.json())
+    # assert
+    assert view.malware_family == 'Eicar'
+    assert view.domains == ('polyswarm.io', 'polyswarm.network')
+    assert view.ip_addresses == ('192.168.0.1',)
+    assert view.stix[0]['signature'] == 'a0'
+    assert view.scanner['environment'] == {'operating_system': 'windows', 'architecture': 'x86'}
+    assert view.heuristic is None
+    assert view.extra == []
+
+
+def test_from_dict_defaults():
+    # arrange
+    # act
+    view = VerdictView.from_dict({'malware_family': 'Eicar'})
+    # assert
+    assert view.domains == ()
+    assert view.ip_addresses == ()
+    assert view.stix == ()
+    assert view.scanner is None
+
+
+def test_extra():
+    # arrange
+    # act
+    view = VerdictView.from_dict({'malware_family': 'Eicar', 'score': 5})
+    # assert
+    assert view.extra == [('score', 5)]
+    assert view.to_dict() == {'malware_family': 'Eicar', 'score': 5}
+
+
+def test_read_only():
+    # arrange
+    view = VerdictView.from_dict({'malware_family': 'Eicar'})
+    # act
+    # assert
+    with pytest.raises(AttributeError):
+        view.malware_family = 'Trojan'
+    with pytest.raises(AttributeError):
+        view.other = 'value'
+    with pytest.raises(AttributeError):
+        del view.domains
+
+
+def test_to_verdict():
+    # arrange
+    verdict = make_verdict()
+    view = VerdictView.from_json(verdict.json())
+    # act
+    converted = view.to_verdict()
+    # assert
+    assert isinstance(converted, Verdict)
+    assert converted.json() == verdict.json()
+
+
+def test_to_verdict_invalid():
+    # arrange
+    view = VerdictView.from_dict({'domains': ['polyswarm.io']})
+    # act
+    # assert
+    with pytest.raises(ValidationError):
+        view.to_verdict()
+
+
+def test_many_from_json():
+    # arrange
+    assertion = Assertion().add_artifacts([make_verdict(), Verdict().set_malware_family('Trojan')])
+    # act
+    views = list(VerdictView.many_from_json(assertion.json()))
+    # assert
+    assert [view.malware_family for view in views] == ['Eicar', 'Trojan']
+    assert views[0] == VerdictView.from_dict(json.loads(assertion.json())[0])